@@ -1,10 +1,11 @@
 """Grammar-ops analyzers for different code elements."""
 from .context_analyzer import ContextAwareFunctionAnalyzer, FunctionContext
-from .constant_detector import SmartConstantAnalyzer, AssignmentContext
+from .constant_detector import SmartConstantAnalyzer, AssignmentContext, ConstantIssue
 
 __all__ = [
     'ContextAwareFunctionAnalyzer', 
     'FunctionContext',
     'SmartConstantAnalyzer',
-    'AssignmentContext'
+    'AssignmentContext',
+    'ConstantIssue'
 ]
\ No newline at end of file
@@ -7,154 +7,332 @@ singleton instances, TypeVar declarations, and other valid lowercase patterns.
 """
 
 import ast
-import re
-from typing import Optional, Dict, List, Tuple, Set
+import copy
+import json
+import sys
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from functools import cached_property, lru_cache
+from typing import Optional, Dict, Iterator, List, Tuple, Set
 from pathlib import Path
 
+try:
+    from ..core.parse_cache import parse_file
+except ImportError:  # Run as a script; lib/core also serves the __main__ imports
+    sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'core'))
+    from parse_cache import parse_file
+
+
+# Callee names by category, matched against the last component of the
+# called name so ``typing.TypeVar(...)`` and ``TypeVar(...)`` both count
+_TYPEVAR_CALLS = frozenset({'TypeVar', 'ParamSpec', 'TypeVarTuple', 'NewType'})
+_SINGLETON_CALLS = frozenset({
+    'FastAPI', 'Flask', 'Typer', 'APIRouter', 'Blueprint', 'Celery', 'Redis',
+    'create_app', 'get_app', 'declarative_base', 'sessionmaker', 'create_engine',
+})
+_LOGGER_CALL_SUFFIXES = ('Logger', 'get_logger')  # also getLogger, RootLogger
+_CONFIG_CALL_SUFFIXES = ('Config', 'Settings')
+
+# Substrings marking a dict/list target as configuration rather than a constant
+_CONFIG_NAME_PARTS = (
+    'config', 'settings', 'options', 'params', 'defaults',
+    'models', 'endpoints', 'routes', 'urls', 'paths',
+)
+
+# Fully qualified callee names
+_REGEX_CALLS = frozenset({'re.compile', 'regex.compile'})
+_ENV_CALLS = frozenset({'os.getenv', 'getenv', 'os.environ.get', 'environ.get'})
+_ENV_MAPPINGS = frozenset({'os.environ', 'environ', 'env'})
+
+# Style codes returned by _name_style
+_STYLE_LOWER, _STYLE_UPPER, _STYLE_PASCAL, _STYLE_OTHER = range(4)
+
+# Exact callee -> assignment type, looked up by full dotted name first and
+# then by its last component
+_CALL_TYPES = {
+    **dict.fromkeys(_TYPEVAR_CALLS, 'typevar'),
+    **dict.fromkeys(_SINGLETON_CALLS, 'singleton'),
+    **dict.fromkeys(_REGEX_CALLS, 'regex'),
+    **dict.fromkeys(_ENV_CALLS, 'env_var'),
+}
+
+# Collections with more elements than this are never treated as constants
+_MAX_CONSTANT_COLLECTION_SIZE = 64
+
+# Builtins commonly wrapped around an environment read, e.g. int(os.getenv(...))
+_CONVERSION_CALLS = frozenset({'int', 'float', 'bool', 'str'})
+
+
+def _qualname(node: ast.AST) -> Optional[str]:
+    """Return the dotted name of a Name/Attribute chain, e.g. ``logging.getLogger``."""
+    parts = []
+    while isinstance(node, ast.Attribute):
+        parts.append(node.attr)
+        node = node.value
+    if not isinstance(node, ast.Name):
+        return None
+    parts.append(node.id)
+    return '.'.join(reversed(parts))
+
+
+def _callee_qualname(node: ast.AST) -> Optional[str]:
+    """Return the dotted name of the function called by ``node``, if it is a call."""
+    if isinstance(node, ast.Call):
+        return _qualname(node.func)
+    return None
+
+
+@lru_cache(maxsize=16384)
+def _name_style(name: str) -> int:
+    """Classify a name as lowercase, UPPER_CASE, PascalCase or none of these.
+    
+    Leading underscores mark private names and don't affect the style. Case
+    is tested with str.isupper/islower so non-ASCII names such as ÄPFEL_MAX
+    are classified like ASCII ones. Cached because names such as logger, app
+    and __all__ recur in almost every module.
+    """
+    rest = name.lstrip('_')
+    if not rest:
+        return _STYLE_LOWER
+    first = rest[0]
+    if first.islower() and rest.islower():
+        return _STYLE_LOWER
+    if first.isupper():
+        if rest.isupper():
+            return _STYLE_UPPER
+        if '_' not in rest:
+            return _STYLE_PASCAL  # Some lowercase letter, since not all upper
+    return _STYLE_OTHER
+
+
+@lru_cache(maxsize=8192)
+def _classify_callee(callee: str) -> Optional[str]:
+    """Classify a call by its dotted callee name.
+    
+    Cached because the same boilerplate callees (logging.getLogger,
+    TypeVar, re.compile, ...) recur across every file of a project.
+    """
+    name = callee.rpartition('.')[2]
+    assignment_type = _CALL_TYPES.get(callee) or _CALL_TYPES.get(name)
+    if assignment_type:
+        return assignment_type
+    
+    # Logger instance
+    if name.endswith(_LOGGER_CALL_SUFFIXES):
+        return 'logger'
+    
+    # Config class instantiation
+    if name.endswith(_CONFIG_CALL_SUFFIXES):
+        return 'config'
+    
+    return None
+
 
 class AssignmentContext:
     """Context for an assignment statement."""
     
+    # __dict__ only holds the cached value_str of reported assignments
+    __slots__ = (
+        'target', 'value_node', 'node', 'file_path', 'callee',
+        'is_module_level', 'assignment_type', '__dict__',
+    )
+    
     def __init__(self, target: str, value_node: ast.AST, node: ast.AST, file_path: Path):
-        self.target = target
+        # Names from unpickled (cached) trees are not interned by the parser
+        self.target = sys.intern(target)
         self.value_node = value_node
         self.node = node
         self.file_path = file_path
-        self.value_str = ast.unparse(value_node) if value_node else ""
+        self.callee = _callee_qualname(value_node)
         self.is_module_level = True  # Will be set by analyzer
         self.assignment_type = self._determine_type()
     
+    @cached_property
+    def value_str(self) -> str:
+        """Unparsed source of the assigned value, built only when an issue is reported."""
+        return ast.unparse(self.value_node) if self.value_node else ""
+    
+    def with_target(self, target: str) -> 'AssignmentContext':
+        """Return this context for another target of the same assignment."""
+        other = copy.copy(self)
+        other.target = sys.intern(target)
+        if isinstance(self.value_node, (ast.Dict, ast.List)):
+            # Config detection depends on the target name
+            other.assignment_type = other._determine_type()
+        return other
+    
     def _determine_type(self) -> str:
         """Determine what type of assignment this is."""
-        # TypeVar and related typing constructs
-        if self._is_typevar():
-            return 'typevar'
-        
-        # Singleton instance (framework objects)
-        if self._is_singleton_instance():
-            return 'singleton'
-        
-        # Logger instance
-        if self._is_logger():
-            return 'logger'
+        value = self.value_node
         
-        # Configuration object
-        if self._is_config_object():
-            return 'config'
-        
-        # Compiled regex
-        if self._is_compiled_regex():
-            return 'regex'
-        
-        # Environment variable
-        if self._is_env_var():
-            return 'env_var'
+        # Calls: TypeVar, singletons, loggers, config classes, regexes, env reads
+        if isinstance(value, ast.Call):
+            return self._classify_call()
         
         # Simple literal constant
-        if self._is_literal_constant():
+        if isinstance(value, ast.Constant):
             return 'constant'
         
-        # Collection constant
-        if self._is_collection_constant():
-            return 'collection_constant'
+        # Collections: named config objects, then constant collections
+        if isinstance(value, (ast.List, ast.Tuple, ast.Set, ast.Dict)):
+            if self._is_config_object():
+                return 'config'
+            if self._is_collection_constant():
+                return 'collection_constant'
+            return 'unknown'
+        
+        # type[...] aliases and os.environ[...] reads
+        if isinstance(value, ast.Subscript):
+            if self._is_typevar():
+                return 'typevar'
+            if self._is_env_var():
+                return 'env_var'
         
         # Default/unknown
         return 'unknown'
     
-    def _is_typevar(self) -> bool:
-        """Check if this is a TypeVar or similar typing construct."""
-        patterns = [
-            r'TypeVar\s*\(',
-            r'ParamSpec\s*\(',
-            r'TypeVarTuple\s*\(',
-            r'NewType\s*\(',
-            r'TypeAlias\s*=',
-            r'type\s*\[',  # Python 3.12+ type syntax
-        ]
-        return any(re.search(pattern, self.value_str) for pattern in patterns)
-    
-    def _is_singleton_instance(self) -> bool:
-        """Check if this is a singleton instance creation."""
-        # Common framework singleton patterns
-        singleton_patterns = [
-            r'FastAPI\s*\(',
-            r'Flask\s*\(',
-            r'Typer\s*\(',
-            r'APIRouter\s*\(',
-            r'Blueprint\s*\(',
-            r'Celery\s*\(',
-            r'Redis\s*\(',
-            r'create_app\s*\(',
-            r'get_app\s*\(',
-            r'declarative_base\s*\(',
-            r'sessionmaker\s*\(',
-            r'create_engine\s*\(',
-        ]
+    def _classify_call(self) -> str:
+        """Classify an assignment whose value is a call."""
+        if self.callee is not None:
+            assignment_type = _classify_callee(self.callee)
+            if assignment_type:
+                return assignment_type
         
-        if isinstance(self.value_node, ast.Call):
-            # It's a function/class call
-            return any(re.search(pattern, self.value_str) for pattern in singleton_patterns)
+        # Environment variable behind a conversion, e.g. int(os.getenv(...))
+        if self._is_env_var():
+            return 'env_var'
         
-        return False
+        return 'unknown'
     
-    def _is_logger(self) -> bool:
-        """Check if this is a logger instance."""
-        logger_patterns = [
-            r'logging\.getLogger',
-            r'get_logger\s*\(',
-            r'Logger\s*\(',
-            r'getLogger\s*\(',
-        ]
-        return any(re.search(pattern, self.value_str) for pattern in logger_patterns)
+    def _is_typevar(self) -> bool:
+        """Check if this is a ``type[...]`` alias."""
+        return (isinstance(self.value_node, ast.Subscript) and
+                isinstance(self.value_node.value, ast.Name) and
+                self.value_node.value.id == 'type')
     
     def _is_config_object(self) -> bool:
         """Check if this is a configuration object."""
-        # Check if it's a dict/list with specific patterns
+        # Check if it's a dict/list with a config-like name
         if isinstance(self.value_node, (ast.Dict, ast.List)):
-            # Common config names
-            config_names = [
-                'config', 'settings', 'options', 'params', 'defaults',
-                'models', 'endpoints', 'routes', 'urls', 'paths'
-            ]
             target_lower = self.target.lower()
-            return any(name in target_lower for name in config_names)
-        
-        # Config class instantiation
-        if 'Config(' in self.value_str or 'Settings(' in self.value_str:
-            return True
-        
+            return any(name in target_lower for name in _CONFIG_NAME_PARTS)
         return False
     
-    def _is_compiled_regex(self) -> bool:
-        """Check if this is a compiled regular expression."""
-        return 're.compile' in self.value_str or 'regex.compile' in self.value_str
-    
     def _is_env_var(self) -> bool:
         """Check if this is reading an environment variable."""
-        env_patterns = [
-            r'os\.environ',
-            r'os\.getenv',
-            r'env\s*\[',
-            r'getenv\s*\(',
-        ]
-        return any(re.search(pattern, self.value_str) for pattern in env_patterns)
-    
-    def _is_literal_constant(self) -> bool:
-        """Check if this is a simple literal constant."""
-        return isinstance(self.value_node, (ast.Constant, ast.Num, ast.Str))
+        node = self.value_node
+        # Look through int(...)/bool(...) style conversions
+        while (isinstance(node, ast.Call) and node.args and
+               _callee_qualname(node) in _CONVERSION_CALLS):
+            node = node.args[0]
+        
+        if isinstance(node, ast.Subscript):
+            return _qualname(node.value) in _ENV_MAPPINGS
+        return _callee_qualname(node) in _ENV_CALLS
     
     def _is_collection_constant(self) -> bool:
         """Check if this is a collection of constants."""
-        if isinstance(self.value_node, (ast.List, ast.Tuple, ast.Set)):
-            # Check if all elements are constants
-            return all(isinstance(elt, (ast.Constant, ast.Num, ast.Str)) 
-                      for elt in self.value_node.elts)
-        elif isinstance(self.value_node, ast.Dict):
-            # Check if all keys and values are constants
-            return all(isinstance(k, (ast.Constant, ast.Num, ast.Str)) and
-                      isinstance(v, (ast.Constant, ast.Num, ast.Str))
-                      for k, v in zip(self.value_node.keys, self.value_node.values))
-        return False
+        value = self.value_node
+        if isinstance(value, (ast.List, ast.Tuple, ast.Set)):
+            elements = value.elts
+        elif isinstance(value, ast.Dict):
+            elements = value.keys
+        else:
+            return False
+        
+        # Large literals are data tables, not constants worth renaming
+        if len(elements) > _MAX_CONSTANT_COLLECTION_SIZE:
+            return False
+        
+        # Check if all elements (and for dicts, all values) are constants
+        for element in elements:
+            if not isinstance(element, ast.Constant):
+                return False
+        if isinstance(value, ast.Dict):
+            for element in value.values:
+                if not isinstance(element, ast.Constant):
+                    return False
+        return True
+
+
+@dataclass(slots=True)
+class ConstantIssue:
+    """A constant naming violation.
+    
+    Supports read-only dict-style access (``issue['name']``, ``issue.get('line')``)
+    so it can be used anywhere a plain issue dict is expected.
+    """
+    file: str
+    line: int
+    name: str
+    current_value: str
+    type: str
+    issue: str
+    rule: Dict
+    auto_fixable: bool
+    
+    def __getitem__(self, key: str):
+        try:
+            return getattr(self, key)
+        except AttributeError:
+            raise KeyError(key) from None
+    
+    def __contains__(self, key: str) -> bool:
+        return key in self.__dataclass_fields__
+    
+    def get(self, key: str, default=None):
+        return getattr(self, key, default)
+    
+    def to_dict(self) -> Dict:
+        """Convert to a plain dict, e.g. for JSON output."""
+        return {key: getattr(self, key) for key in self.__dataclass_fields__}
+
+
+class _ModuleScanVisitor(ast.NodeVisitor):
+    """Checks every module-level assignment in a single pass over the module body."""
+    
+    def __init__(self, analyzer: 'SmartConstantAnalyzer', file_path: Path):
+        self.analyzer = analyzer
+        self.file_path = file_path
+        self.issues: List[ConstantIssue] = []
+        self.by_type = Counter()
+    
+    def visit_Module(self, node: ast.Module):
+        for child in node.body:
+            self.visit(child)
+    
+    def generic_visit(self, node: ast.AST):
+        # Only module-level statements are analyzed; don't descend
+        pass
+    
+    def visit_Assign(self, node: ast.Assign):
+        # Chained targets (a = b = ...) share one context
+        context = None
+        for target in node.targets:
+            if type(target) is not ast.Name:
+                continue
+            if context is None:
+                context = AssignmentContext(
+                    target.id, node.value, node, self.file_path
+                )
+            else:
+                context = context.with_target(target.id)
+            
+            self._check(context)
+            self.by_type[context.assignment_type] += 1
+    
+    def visit_AnnAssign(self, node: ast.AnnAssign):
+        # Annotated assignment with a value
+        if node.value and type(node.target) is ast.Name:
+            self._check(AssignmentContext(
+                node.target.id, node.value, node, self.file_path
+            ))
+    
+    def _check(self, context: AssignmentContext):
+        issue = self.analyzer._check_assignment(context)
+        if issue:
+            self.issues.append(issue)
 
 
 class SmartConstantAnalyzer:
@@ -204,21 +382,58 @@ class SmartConstantAnalyzer:
         }
     }
     
-    def __init__(self, framework_detector=None):
+    # Issues kept in memory for get_report when streaming them to disk
+    REPORT_ISSUE_LIMIT = 10
+    
+    def __init__(self, framework_detector=None, parse_cache=None,
+                 issues_path: Optional[Path] = None):
         self.framework_detector = framework_detector
-        self.issues: List[Dict] = []
+        self.parse_cache = parse_cache
+        # Filled only by record_issues; analyze_file(s) just return what they find
+        self.issues: List[ConstantIssue] = []
+        
+        # With issues_path, issues go to a JSON-lines file and only the first
+        # REPORT_ISSUE_LIMIT stay in self.issues. The file is opened on the
+        # first issue and closed by close(), or on leaving a with block.
+        self.issues_path = Path(issues_path) if issues_path else None
+        self._issues_file = None
+        self._issues_streamed = False
         self.stats = {
             'total_assignments': 0,
-            'by_type': {},
+            'by_type': Counter(),
             'violations': 0,
             'auto_classified': 0
         }
+        
+        # Flatten TYPE_RULES into assignment type -> (style check, rule)
+        style_checks = {
+            'uppercase': self._check_uppercase_style,
+            'lowercase': self._check_lowercase_style,
+            'single_letter_or_pascal': self._check_typevar_style,
+            'flexible': self._check_flexible_style,
+        }
+        self._type_checks = {
+            assignment_type: (style_checks[rule['style']], rule)
+            for assignment_type, rule in self.TYPE_RULES.items()
+        }
     
-    def analyze_file(self, file_path: Path) -> List[Dict]:
-        """Analyze all module-level assignments in a file."""
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *exc_info):
+        self.close()
+    
+    def analyze_file(self, file_path: Path, source: Optional[bytes] = None,
+                     tree: Optional[ast.Module] = None) -> List[Dict]:
+        """Analyze all module-level assignments in a file, reading and parsing only what isn't given."""
         try:
-            content = file_path.read_text(encoding='utf-8')
-            tree = ast.parse(content)
+            if tree is None:
+                if source is not None:
+                    tree = ast.parse(source, filename=str(file_path))
+                elif self.parse_cache:
+                    _, tree = self.parse_cache.load(file_path)
+                else:
+                    _, tree = parse_file(file_path)
             return self._analyze_module(tree, file_path)
         except Exception as e:
             return [{
@@ -226,98 +441,142 @@ class SmartConstantAnalyzer:
                 'error': f'Failed to parse: {str(e)}'
             }]
     
-    def _analyze_module(self, tree: ast.Module, file_path: Path) -> List[Dict]:
-        """Analyze module-level assignments."""
+    def analyze_files(self, file_paths: List[Path],
+                      max_workers: Optional[int] = None) -> List[Dict]:
+        """Analyze many files across a process pool, merging stats into this analyzer."""
         issues = []
         
-        for node in tree.body:
-            if isinstance(node, ast.Assign):
-                # Simple assignment
-                for target in node.targets:
-                    if isinstance(target, ast.Name):
-                        context = AssignmentContext(
-                            target.id, node.value, node, file_path
-                        )
-                        issue = self._check_assignment(context)
-                        if issue:
-                            issues.append(issue)
-                        
-                        # Update stats
-                        self.stats['total_assignments'] += 1
-                        assignment_type = context.assignment_type
-                        self.stats['by_type'][assignment_type] = \
-                            self.stats['by_type'].get(assignment_type, 0) + 1
-            
-            elif isinstance(node, ast.AnnAssign) and isinstance(node.target, ast.Name):
-                # Annotated assignment
-                if node.value:  # Has a value
-                    context = AssignmentContext(
-                        node.target.id, node.value, node, file_path
-                    )
-                    issue = self._check_assignment(context)
-                    if issue:
-                        issues.append(issue)
+        with ProcessPoolExecutor(max_workers=max_workers,
+                                 initializer=_init_worker,
+                                 initargs=(self.framework_detector, self.parse_cache)) as pool:
+            for file_issues, stats in pool.map(_analyze_file_in_worker, file_paths, chunksize=16):
+                for issue in file_issues:
+                    # Unpickled strings are fresh copies; share one object per name/type
+                    if isinstance(issue, ConstantIssue):
+                        issue.name = sys.intern(issue.name)
+                        issue.type = sys.intern(issue.type)
+                issues.extend(file_issues)
+                self._merge_stats(stats)
         
         return issues
     
-    def _check_assignment(self, context: AssignmentContext) -> Optional[Dict]:
-        """Check if an assignment follows naming conventions."""
-        name = context.target
-        assignment_type = context.assignment_type
-        
-        # Unknown types need manual review
-        if assignment_type == 'unknown':
-            return None
-        
-        rule = self.TYPE_RULES[assignment_type]
+    def record_issues(self, issues: List):
+        """Keep issues for get_report and generate_exceptions, streaming them to issues_path if given."""
+        for issue in issues:
+            if not isinstance(issue, ConstantIssue):
+                continue  # Parse errors are only returned to the caller
+            
+            if self.issues_path:
+                if not self._issues_file:
+                    # Start a fresh file on the first issue, append after a close()
+                    mode = 'a' if self._issues_streamed else 'w'
+                    self._issues_file = open(self.issues_path, mode, encoding='utf-8')
+                    self._issues_streamed = True
+                self._issues_file.write(json.dumps(issue.to_dict()) + '\n')
+                if len(self.issues) < self.REPORT_ISSUE_LIMIT:
+                    self.issues.append(issue)
+            else:
+                self.issues.append(issue)
+    
+    def iter_issues(self) -> Iterator[ConstantIssue]:
+        """Iterate over every recorded issue, reading streamed issues back from disk."""
+        if not self._issues_streamed:
+            yield from self.issues
+            return
         
-        # Check naming style
-        if rule['style'] == 'uppercase':
-            if not self._is_uppercase(name):
-                return self._create_issue(context, rule, 'should be UPPER_CASE')
+        if self._issues_file:
+            self._issues_file.flush()
+        with open(self.issues_path, encoding='utf-8') as f:
+            for line in f:
+                yield ConstantIssue(**json.loads(line))
+    
+    def close(self):
+        """Close the streamed issues file, if any."""
+        if self._issues_file:
+            self._issues_file.close()
+            self._issues_file = None
+    
+    def _merge_stats(self, stats: Dict):
+        """Fold another analyzer's stats into this one."""
+        for key in ('total_assignments', 'violations', 'auto_classified'):
+            self.stats[key] += stats[key]
+        self.stats['by_type'] += stats['by_type']
+    
+    def _analyze_module(self, tree: ast.Module, file_path: Path) -> List[Dict]:
+        """Analyze module-level assignments."""
+        visitor = _ModuleScanVisitor(self, file_path)
+        visitor.visit(tree)
         
-        elif rule['style'] == 'lowercase':
-            if not self._is_lowercase(name):
-                self.stats['auto_classified'] += 1
-                return self._create_issue(context, rule, 'should be lowercase')
+        # Update stats once per module
+        self.stats['total_assignments'] += visitor.by_type.total()
+        self.stats['by_type'] += visitor.by_type
         
-        elif rule['style'] == 'single_letter_or_pascal':
-            if not (len(name) == 1 and name.isupper()) and not self._is_pascal_case(name):
-                return self._create_issue(context, rule, 'should be single letter or PascalCase')
+        return visitor.issues
+    
+    def _check_assignment(self, context: AssignmentContext) -> Optional[ConstantIssue]:
+        """Check if an assignment follows naming conventions."""
+        entry = self._type_checks.get(context.assignment_type)
         
-        elif rule['style'] == 'flexible':
-            # No strict rule, but track for stats
-            self.stats['auto_classified'] += 1
+        # Unknown types need manual review
+        if entry is None:
             return None
         
+        check, rule = entry
+        return check(context, rule)
+    
+    def _check_uppercase_style(self, context: AssignmentContext, rule: Dict) -> Optional[ConstantIssue]:
+        """Require UPPER_CASE."""
+        if not self._is_uppercase(context.target):
+            return self._create_issue(context, rule, 'should be UPPER_CASE')
+        return None
+    
+    def _check_lowercase_style(self, context: AssignmentContext, rule: Dict) -> Optional[ConstantIssue]:
+        """Require lowercase."""
+        if not self._is_lowercase(context.target):
+            self.stats['auto_classified'] += 1
+            return self._create_issue(context, rule, 'should be lowercase')
+        return None
+    
+    def _check_typevar_style(self, context: AssignmentContext, rule: Dict) -> Optional[ConstantIssue]:
+        """Require a single capital letter or PascalCase."""
+        name = context.target
+        if not (len(name) == 1 and name.isupper()) and not self._is_pascal_case(name):
+            return self._create_issue(context, rule, 'should be single letter or PascalCase')
+        return None
+    
+    def _check_flexible_style(self, context: AssignmentContext, rule: Dict) -> Optional[ConstantIssue]:
+        """Accept any style."""
+        # No strict rule, but track for stats
+        self.stats['auto_classified'] += 1
         return None
     
     def _is_uppercase(self, name: str) -> bool:
         """Check if name is UPPER_CASE style."""
-        return name.isupper() and '_' in name or (name.isupper() and len(name) > 1)
+        return _name_style(name) == _STYLE_UPPER
     
     def _is_lowercase(self, name: str) -> bool:
         """Check if name is lowercase style."""
-        return name.islower() or '_' in name and name.replace('_', '').islower()
+        return _name_style(name) == _STYLE_LOWER
     
     def _is_pascal_case(self, name: str) -> bool:
         """Check if name is PascalCase."""
-        return name[0].isupper() and not '_' in name and not name.isupper()
+        return _name_style(name) == _STYLE_PASCAL
     
-    def _create_issue(self, context: AssignmentContext, rule: Dict, message: str) -> Dict:
+    def _create_issue(self, context: AssignmentContext, rule: Dict, message: str) -> ConstantIssue:
         """Create an issue report."""
         self.stats['violations'] += 1
+        value_str = context.value_str
         
-        return {
-            'file': str(context.file_path),
-            'line': context.node.lineno,
-            'name': context.target,
-            'current_value': context.value_str[:50] + '...' if len(context.value_str) > 50 else context.value_str,
-            'type': context.assignment_type,
-            'issue': message,
-            'rule': rule,
-            'auto_fixable': self._can_auto_fix(context)
-        }
+        return ConstantIssue(
+            file=str(context.file_path),
+            line=context.node.lineno,
+            name=context.target,
+            current_value=value_str[:50] + '...' if len(value_str) > 50 else value_str,
+            type=context.assignment_type,
+            issue=message,
+            rule=rule,
+            auto_fixable=self._can_auto_fix(context)
+        )
     
     def _can_auto_fix(self, context: AssignmentContext) -> bool:
         """Check if this can be automatically fixed."""
@@ -365,7 +624,7 @@ class SmartConstantAnalyzer:
             'typevars': []
         }
         
-        for issue in self.issues:
+        for issue in self.iter_issues():
             if issue['type'] == 'singleton':
                 exceptions['singletons'].append(f"{issue['name']} = {issue['current_value']}")
             elif issue['type'] == 'logger':
@@ -376,9 +635,26 @@ class SmartConstantAnalyzer:
         return exceptions
 
 
+# Analyzer arguments for pool workers, set once per process by _init_worker
+_worker_args: Tuple = ()
+
+
+def _init_worker(framework_detector, parse_cache):
+    """Process pool initializer for SmartConstantAnalyzer.analyze_files."""
+    global _worker_args
+    _worker_args = (framework_detector, parse_cache)
+
+
+def _analyze_file_in_worker(file_path: Path) -> Tuple[List[Dict], Dict]:
+    """Analyze one file with a fresh analyzer, returning its issues and stats."""
+    analyzer = SmartConstantAnalyzer(*_worker_args)
+    return analyzer.analyze_file(file_path), analyzer.stats
+
+
 if __name__ == "__main__":
-    import sys
     from framework_detector import detect_frameworks
+    from parse_cache import ParseCache
+    from file_walker import iter_py_files
     
     if len(sys.argv) < 2:
         print("Usage: constant-detector.py <project_root>")
@@ -389,22 +665,17 @@ if __name__ == "__main__":
     # Detect frameworks first
     detector = detect_frameworks(project_root)
     
-    # Analyze constants
-    analyzer = SmartConstantAnalyzer(detector)
-    
-    # Analyze Python files
-    py_files = list(project_root.rglob("*.py"))
-    for py_file in py_files[:50]:  # Limit for demo
-        if '.git' in py_file.parts or '__pycache__' in py_file.parts:
-            continue
-        analyzer.analyze_file(py_file)
-    
-    print(analyzer.get_report())
-    
-    # Generate exceptions
-    print("\n" + "=" * 50)
-    print("Suggested exceptions for .grammarops.exceptions.json:")
-    exceptions = analyzer.generate_exceptions()
+    # Analyze constants, reusing parsed trees from previous runs
+    with SmartConstantAnalyzer(detector, ParseCache()) as analyzer:
+        # Analyze Python files in parallel
+        analyzer.record_issues(analyzer.analyze_files(list(iter_py_files(project_root))))
+        
+        print(analyzer.get_report())
+        
+        # Generate exceptions
+        print("\n" + "=" * 50)
+        print("Suggested exceptions for .grammarops.exceptions.json:")
+        exceptions = analyzer.generate_exceptions()
     for category, items in exceptions.items():
         if items:
             print(f"\n{category}:")
@@ -7,65 +7,165 @@ Recognizes patterns like CLI commands, test functions, factories, etc.
 """
 
 import ast
+import os
 import re
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
 from typing import Optional, Dict, List, Tuple, Set
 from pathlib import Path
 
+# Common verb prefixes; a name has one if its first underscore-separated word is in here
+_VERB_PREFIXES = frozenset({
+    'get', 'set', 'create', 'update', 'delete', 'remove', 'add',
+    'process', 'validate', 'check', 'verify', 'ensure', 'handle',
+    'parse', 'format', 'convert', 'transform', 'build', 'generate',
+    'load', 'save', 'read', 'write', 'fetch', 'send', 'receive',
+    'start', 'stop', 'run', 'execute', 'perform', 'calculate',
+    'is', 'has', 'can', 'should', 'will', 'must',
+})
+
+# Cheap prefilter on raw source; also matches 'async def'
+_DEF_RE = re.compile(rb'\bdef\s')
+
+# Decorator name (without '@' or call arguments) -> context it implies
+_DECORATOR_CONTEXTS = {
+    'cli.command': 'cli_command',
+    'app.command': 'cli_command',
+    'click.command': 'cli_command',
+    'pytest.fixture': 'pytest_fixture',
+    'property': 'property',
+    'validator': 'validator',
+    'field_validator': 'validator',
+}
+
+# Decorator owner object -> context, for any attribute such as app.get or router.post
+_DECORATOR_OWNER_CONTEXTS = {
+    'app': 'api_endpoint',
+    'router': 'api_endpoint',
+}
+
+# When decorators imply several contexts, the lowest ranked one wins
+_DECORATOR_CONTEXT_RANK = {
+    context: rank for rank, context in enumerate(
+        ('cli_command', 'api_endpoint', 'pytest_fixture', 'property', 'validator')
+    )
+}
+
+
+def _decorator_name(node: ast.AST) -> Optional[str]:
+    """Return a decorator's dotted name without call arguments, e.g. ``app.command``."""
+    if isinstance(node, ast.Call):
+        node = node.func
+    parts = []
+    while isinstance(node, ast.Attribute):
+        parts.append(node.attr)
+        node = node.value
+    if not isinstance(node, ast.Name):
+        return None
+    parts.append(node.id)
+    return '.'.join(reversed(parts))
+
+
+@lru_cache(maxsize=4096)
+def _starts_with_verb(name: str) -> bool:
+    """Check if a name's first underscore-separated word is a verb.
+    
+    Cached because names like __init__, setUp and get_user recur across a project.
+    """
+    return name.lower().partition('_')[0] in _VERB_PREFIXES
+
 
 class FunctionContext:
     """Represents the context of a function."""
     
-    def __init__(self, name: str, node: ast.FunctionDef, file_path: Path):
-        self.name = name
-        self.node = node
+    # Only the small decorator subtrees are kept, not the function node, so a
+    # module's tree can be freed once analyzed
+    __slots__ = (
+        'name', 'lineno', 'file_path', 'decorator_names', 'returns_type', '_first_expr',
+        'is_method', 'is_async', 'parent_class', '_decorator_nodes', '_decorators',
+        '_decorator_context', '_context_type',
+    )
+    
+    def __init__(self, name: str, node: ast.FunctionDef, file_path: Path,
+                 parent_class: Optional[str] = None):
+        self.reset(name, node, file_path, parent_class)
+    
+    def reset(self, name: str, node: ast.FunctionDef, file_path: Path,
+              parent_class: Optional[str] = None):
+        """Re-populate this context in place for another function."""
+        self.name = sys.intern(name)
+        self.lineno = node.lineno
         self.file_path = file_path
-        self.decorators: List[str] = []
+        self.decorator_names: List[str] = []
+        self._decorators: Optional[List[str]] = None
         self.returns_type: Optional[str] = None
-        self.docstring: Optional[str] = None
-        self.is_method = False
+        self.is_method = parent_class is not None
         self.is_async = isinstance(node, ast.AsyncFunctionDef)
-        self.parent_class: Optional[str] = None
-        self._analyze()
+        self.parent_class = parent_class
+        self._analyze(node)
+        self._context_type = self._classify()
     
-    def _analyze(self):
+    def _analyze(self, node: ast.FunctionDef):
         """Analyze the function node to extract context."""
-        # Extract decorators
-        for decorator in self.node.decorator_list:
-            self.decorators.append(ast.unparse(decorator))
+        # Extract decorator names; the full source is only rendered on demand
+        self._decorator_nodes = node.decorator_list
+        for decorator in node.decorator_list:
+            name = _decorator_name(decorator)
+            if name:
+                self.decorator_names.append(sys.intern(name))
+        
+        self._decorator_context = self._classify_decorators()
         
         # Extract return type if annotated
-        if self.node.returns:
-            self.returns_type = ast.unparse(self.node.returns)
+        if node.returns:
+            self.returns_type = ast.unparse(node.returns)
         
-        # Extract docstring
-        if (self.node.body and 
-            isinstance(self.node.body[0], ast.Expr) and
-            isinstance(self.node.body[0].value, ast.Constant)):
-            self.docstring = self.node.body[0].value.value
+        # Keep a possible docstring statement; it is only read when suggesting a name
+        self._first_expr = node.body[0] if node.body and isinstance(node.body[0], ast.Expr) else None
+    
+    @property
+    def docstring(self) -> Optional[str]:
+        """Get the docstring, extracted only when asked for."""
+        if self._first_expr is not None and isinstance(self._first_expr.value, ast.Constant):
+            return self._first_expr.value.value
+        return None
+    
+    @property
+    def decorators(self) -> List[str]:
+        """Get the decorators' source text, without the '@'."""
+        if self._decorators is None:
+            self._decorators = [ast.unparse(decorator) for decorator in self._decorator_nodes]
+        return self._decorators
+    
+    def _classify_decorators(self) -> Optional[str]:
+        """Get the highest-priority context implied by any decorator."""
+        best = None
+        for name in self.decorator_names:
+            context = _DECORATOR_CONTEXTS.get(name)
+            if context is None and '.' in name:
+                context = _DECORATOR_OWNER_CONTEXTS.get(name.partition('.')[0])
+            if context and (best is None or
+                            _DECORATOR_CONTEXT_RANK[context] < _DECORATOR_CONTEXT_RANK[best]):
+                best = context
+        return best
     
     @property
     def context_type(self) -> str:
+        """Get the function's context type."""
+        return self._context_type
+    
+    def _classify(self) -> str:
         """Determine the function's context type."""
+        decorator_context = self._decorator_context
+        
         # Test function
         if self.name.startswith('test_'):
             return 'test_function'
         
-        # CLI command
-        if any('@cli.command' in d or '@app.command' in d or 
-               '@click.command' in d for d in self.decorators):
-            return 'cli_command'
-        
-        # API endpoint
-        if any('@app.' in d or '@router.' in d for d in self.decorators):
-            return 'api_endpoint'
-        
-        # Pytest fixture
-        if any('@pytest.fixture' in d for d in self.decorators):
-            return 'pytest_fixture'
-        
-        # Property
-        if any('@property' in d for d in self.decorators):
-            return 'property'
+        # CLI command, API endpoint, pytest fixture or property
+        if decorator_context and decorator_context != 'validator':
+            return decorator_context
         
         # Response factory
         if (self.name.endswith('_response') and 
@@ -77,7 +177,7 @@ class FunctionContext:
             return 'event_handler'
         
         # Validator (Pydantic style)
-        if any('@validator' in d or '@field_validator' in d for d in self.decorators):
+        if decorator_context == 'validator':
             return 'validator'
         
         # Boolean check
@@ -171,6 +271,12 @@ class ContextAwareFunctionAnalyzer:
             'example': '__init__, __str__, __repr__',
             'reason': 'Python special methods have fixed names'
         },
+        'test_method': {
+            'require_verb_prefix': False,
+            'pattern': 'test_* or setUp/tearDown',
+            'example': 'test_login, setUp, tearDown',
+            'reason': 'Test class methods follow the test framework\'s naming'
+        },
         'regular_function': {
             'require_verb_prefix': True,
             'pattern': 'verb_noun',
@@ -181,6 +287,7 @@ class ContextAwareFunctionAnalyzer:
     
     def __init__(self, framework_detector=None):
         self.framework_detector = framework_detector
+        # Filled only by record_issues; analyze_file(s) just return what they find
         self.issues: List[Dict] = []
         self.stats = {
             'total_functions': 0,
@@ -188,30 +295,85 @@ class ContextAwareFunctionAnalyzer:
             'violations': 0,
             'exceptions_applied': 0
         }
+        
+        self._scratch_context = FunctionContext.__new__(FunctionContext)
+        
+        # Context type -> (check, rule), so checking a function is one lookup
+        special_checks = {
+            'boolean_check': self._accept,  # Already has is_ or has_ prefix
+            'getter': self._accept,  # Already has get_ prefix
+            'cli_command': self._check_cli_command,
+            'response_factory': self._accept_factory,
+        }
+        self._context_checks = {}
+        for ctx_type, rule in self.CONTEXT_RULES.items():
+            if rule['require_verb_prefix'] is False:
+                check = self._accept
+            else:
+                check = special_checks.get(ctx_type, self._check_verb_prefix)
+            self._context_checks[ctx_type] = (check, rule)
     
-    def analyze_file(self, file_path: Path) -> List[Dict]:
-        """Analyze all functions in a file."""
+    def analyze_file(self, file_path: Path, source: Optional[bytes] = None,
+                     tree: Optional[ast.Module] = None) -> List[Dict]:
+        """Analyze all functions in a file, reading and parsing only what isn't given."""
         try:
-            content = file_path.read_text(encoding='utf-8')
-            tree = ast.parse(content)
-            return self._analyze_node(tree, file_path)
+            if tree is None:
+                if source is None:
+                    with open(file_path, 'rb') as f:
+                        source = f.read()
+                
+                # A file without a def has no functions to check, so skip parsing it
+                if not _DEF_RE.search(source):
+                    return []
+                
+                tree = ast.parse(source, filename=str(file_path))
+            issues = []
+            self._visit(tree, file_path, None, issues)
+            return issues
         except Exception as e:
             return [{
                 'file': str(file_path),
                 'error': f'Failed to parse: {str(e)}'
             }]
     
-    def _analyze_node(self, node: ast.AST, file_path: Path, 
-                     parent_class: Optional[str] = None) -> List[Dict]:
-        """Recursively analyze AST nodes."""
+    def analyze_files(self, file_paths: List[Path],
+                      max_workers: Optional[int] = None) -> List[Dict]:
+        """Analyze many files across a process pool, merging stats into this analyzer."""
         issues = []
+        if not file_paths:
+            return issues
+        
+        if max_workers is None:
+            max_workers = min(os.cpu_count() or 1, len(file_paths))
         
-        for child in ast.walk(node):
+        with ProcessPoolExecutor(max_workers=max_workers,
+                                 initializer=_init_worker,
+                                 initargs=(self.framework_detector,)) as pool:
+            for file_issues, stats in pool.map(_analyze_file_in_worker, file_paths, chunksize=16):
+                issues.extend(file_issues)
+                self._merge_stats(stats)
+        
+        return issues
+    
+    def record_issues(self, issues: List[Dict]):
+        """Keep issues for get_report, leaving out parse errors."""
+        self.issues.extend(issue for issue in issues if 'error' not in issue)
+    
+    def _merge_stats(self, stats: Dict):
+        """Fold another analyzer's stats into this one."""
+        for key in ('total_functions', 'violations', 'exceptions_applied'):
+            self.stats[key] += stats[key]
+        for ctx_type, count in stats['by_context'].items():
+            self.stats['by_context'][ctx_type] = self.stats['by_context'].get(ctx_type, 0) + count
+    
+    def _visit(self, node: ast.AST, file_path: Path,
+               parent_class: Optional[str], issues: List[Dict]):
+        """Analyze the functions under a node, descending into each child once."""
+        for child in ast.iter_child_nodes(node):
             if isinstance(child, (ast.FunctionDef, ast.AsyncFunctionDef)):
-                context = FunctionContext(child.name, child, file_path)
-                if parent_class:
-                    context.parent_class = parent_class
-                    context.is_method = True
+                # Contexts are only read while checking, so one is reused for every function
+                context = self._scratch_context
+                context.reset(child.name, child, file_path, parent_class)
                 
                 issue = self._check_function(context)
                 if issue:
@@ -221,66 +383,46 @@ class ContextAwareFunctionAnalyzer:
                 self.stats['total_functions'] += 1
                 ctx_type = context.context_type
                 self.stats['by_context'][ctx_type] = self.stats['by_context'].get(ctx_type, 0) + 1
+                
+                # Functions nested in a function body are not methods
+                self._visit(child, file_path, None, issues)
             
             elif isinstance(child, ast.ClassDef):
-                # Recursively analyze methods in classes
-                class_issues = self._analyze_node(child, file_path, child.name)
-                issues.extend(class_issues)
-        
-        return issues
+                self._visit(child, file_path, child.name, issues)
+            
+            elif not isinstance(child, ast.expr):  # Expressions never contain a def
+                self._visit(child, file_path, parent_class, issues)
     
     def _check_function(self, context: FunctionContext) -> Optional[Dict]:
         """Check if a function follows naming conventions for its context."""
-        rule = self.CONTEXT_RULES[context.context_type]
-        
-        # Check if verb prefix is required
-        if rule['require_verb_prefix'] is False:
-            return None  # No violation
-        
-        if rule['require_verb_prefix'] is True:
-            if context.context_type == 'boolean_check':
-                # Already has is_ or has_ prefix
-                return None
-            elif context.context_type == 'getter':
-                # Already has get_ prefix
-                return None
-            elif not self._has_verb_prefix(context.name):
-                return self._create_issue(context, rule)
-        
-        elif rule['require_verb_prefix'] == 'optional':
-            # Check framework preferences
-            if context.context_type == 'cli_command':
-                cli_style = self._get_cli_style()
-                if cli_style == 'rails':
-                    # Rails style is OK without verb prefix
-                    self.stats['exceptions_applied'] += 1
-                    return None
-            elif context.context_type == 'response_factory':
-                # Factory pattern is OK
-                self.stats['exceptions_applied'] += 1
-                return None
-        
-        # Default check
-        if not self._has_verb_prefix(context.name) and rule['require_verb_prefix']:
+        check, rule = self._context_checks[context.context_type]
+        return check(context, rule)
+    
+    def _accept(self, context: FunctionContext, rule: Dict) -> Optional[Dict]:
+        """Accept any name."""
+        return None
+    
+    def _accept_factory(self, context: FunctionContext, rule: Dict) -> Optional[Dict]:
+        """Accept factory names, which describe what they create."""
+        self.stats['exceptions_applied'] += 1
+        return None
+    
+    def _check_cli_command(self, context: FunctionContext, rule: Dict) -> Optional[Dict]:
+        """Accept Rails-style command names when the CLI framework uses them."""
+        if self._get_cli_style() == 'rails':
+            self.stats['exceptions_applied'] += 1
+            return None
+        return self._check_verb_prefix(context, rule)
+    
+    def _check_verb_prefix(self, context: FunctionContext, rule: Dict) -> Optional[Dict]:
+        """Require a verb prefix."""
+        if not self._has_verb_prefix(context.name):
             return self._create_issue(context, rule)
-        
         return None
     
     def _has_verb_prefix(self, name: str) -> bool:
         """Check if function name starts with a verb."""
-        # Common verb prefixes
-        verbs = [
-            'get', 'set', 'create', 'update', 'delete', 'remove', 'add',
-            'process', 'validate', 'check', 'verify', 'ensure', 'handle',
-            'parse', 'format', 'convert', 'transform', 'build', 'generate',
-            'load', 'save', 'read', 'write', 'fetch', 'send', 'receive',
-            'start', 'stop', 'run', 'execute', 'perform', 'calculate',
-            'is', 'has', 'can', 'should', 'will', 'must'
-        ]
-        
-        name_lower = name.lower()
-        return any(name_lower.startswith(verb + '_') or name_lower == verb 
-                  for verb in verbs)
+        return _starts_with_verb(name)
     
     def _get_cli_style(self) -> str:
         """Get CLI style preference from framework detector."""
@@ -296,7 +438,7 @@ class ContextAwareFunctionAnalyzer:
         
         return {
             'file': str(context.file_path),
-            'line': context.node.lineno,
+            'line': context.lineno,
             'function': context.name,
             'context': context.context_type,
             'issue': 'Missing verb prefix',
@@ -357,9 +499,26 @@ class ContextAwareFunctionAnalyzer:
         return "\n".join(report)
 
 
+# Analyzer arguments for pool workers, set once per process by _init_worker
+_worker_args: Tuple = ()
+
+
+def _init_worker(framework_detector):
+    """Process pool initializer for ContextAwareFunctionAnalyzer.analyze_files."""
+    global _worker_args
+    _worker_args = (framework_detector,)
+
+
+def _analyze_file_in_worker(file_path: Path) -> Tuple[List[Dict], Dict]:
+    """Analyze one file with a fresh analyzer, returning its issues and stats."""
+    analyzer = ContextAwareFunctionAnalyzer(*_worker_args)
+    return analyzer.analyze_file(file_path), analyzer.stats
+
+
 if __name__ == "__main__":
-    import sys
+    sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'core'))
     from framework_detector import detect_frameworks
+    from file_walker import iter_py_files
     
     if len(sys.argv) < 2:
         print("Usage: context-analyzer.py <project_root>")
@@ -376,11 +535,7 @@ if __name__ == "__main__":
     # Analyze functions with context
     analyzer = ContextAwareFunctionAnalyzer(detector)
     
-    # Analyze Python files
-    py_files = list(project_root.rglob("*.py"))
-    for py_file in py_files:
-        if '.git' in py_file.parts or '__pycache__' in py_file.parts:
-            continue
-        analyzer.analyze_file(py_file)
+    # Analyze Python files in parallel
+    analyzer.record_issues(analyzer.analyze_files(list(iter_py_files(project_root))))
     
     print(analyzer.get_report())
\ No newline at end of file
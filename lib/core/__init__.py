@@ -1,4 +1,6 @@
 """Core grammar-ops functionality."""
 from .framework_detector import FrameworkDetector, detect_frameworks
+from .parse_cache import ParseCache, parse_file
+from .file_walker import iter_py_files
 
-__all__ = ['FrameworkDetector', 'detect_frameworks']
\ No newline at end of file
+__all__ = ['FrameworkDetector', 'detect_frameworks', 'ParseCache', 'parse_file', 'iter_py_files']
\ No newline at end of file
@@ -0,0 +1,41 @@
+#!/usr/bin/env python3
+"""
+Python File Discovery for Grammar-Ops
+
+Walks a project with os.scandir, pruning directories such as .git and
+__pycache__ as soon as they are seen instead of descending into them and
+filtering their files afterwards.
+"""
+
+import os
+from pathlib import Path
+from typing import Iterator, FrozenSet
+
+# Directories that never contain project source worth analyzing
+DEFAULT_SKIP_DIRS = frozenset({
+    '.git', '__pycache__', 'node_modules', '.venv', 'venv', 'site-packages',
+})
+
+
+def iter_py_files(root: Path, skip_dirs: FrozenSet[str] = DEFAULT_SKIP_DIRS) -> Iterator[Path]:
+    """Yield every ``.py`` file under root, skipping excluded directories entirely.
+    
+    Directories are visited depth-first in scandir order, the same order as
+    ``Path.rglob``, so "first N files" samples don't change with the walker.
+    """
+    stack = [os.fspath(root)]
+    
+    while stack:
+        directory = stack.pop()
+        subdirs = []
+        try:
+            with os.scandir(directory) as entries:
+                for entry in entries:
+                    if entry.is_dir(follow_symlinks=False):
+                        if entry.name not in skip_dirs:
+                            subdirs.append(entry.path)
+                    elif entry.name.endswith('.py') and entry.is_file():
+                        yield Path(entry.path)
+        except OSError:
+            continue
+        stack.extend(reversed(subdirs))
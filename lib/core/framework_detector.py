@@ -7,10 +7,24 @@ This allows grammar-ops to be context-aware and respect framework idioms.
 """
 
 import ast
+import hashlib
+import json
+import os
+import random
 import re
 from pathlib import Path
 from typing import Dict, List, Set, Optional, Tuple
 
+try:
+    from .file_walker import iter_py_files
+    from .parse_cache import user_cache_dir
+except ImportError:  # Run as a script from lib/core
+    from file_walker import iter_py_files
+    from parse_cache import user_cache_dir
+
+# Imported module names, one per import line
+_IMPORT_RE = re.compile(r'^(?:from\s+(\S+)|import\s+(\S+))', re.MULTILINE)
+
 
 class FrameworkDetector:
     """Detects frameworks and libraries used in a Python project."""
@@ -95,57 +109,188 @@ class FrameworkDetector:
         'generic': r'^[A-Z]\s*=\s*(?:Type|List|Dict|Optional|Union|Generic)\[',
     }
     
-    def __init__(self, project_root: Path):
+    # All typing patterns as one alternation, so a line is matched once
+    _TYPING_RE = re.compile('|'.join(f'(?:{regex})' for regex in TYPING_PATTERNS.values()))
+    
+    # Evidence entries kept per framework; get_report only shows this many
+    MAX_EVIDENCE = 3
+    
+    # Number of files read to detect frameworks
+    SAMPLE_SIZE = 50
+    
+    def __init__(self, project_root: Path, cache_dir: Optional[Path] = None):
         self.project_root = Path(project_root)
+        # Per-file scan results, one JSON file per project
+        self.cache_dir = Path(cache_dir) if cache_dir else self.default_cache_dir()
         self.detected_frameworks: Set[str] = set()
         self.framework_evidence: Dict[str, List[str]] = {}
+        self.evidence_counts: Dict[str, int] = {}
+        self._build_literal_matcher()
         self._scan_project()
     
+    def _build_literal_matcher(self):
+        """Compile every code pattern, decorator and import literal into alternations."""
+        literals = set()
+        self._import_literal_frameworks: Dict[str, List[str]] = {}
+        for framework, patterns in self.FRAMEWORK_PATTERNS.items():
+            literals.update(patterns.get('patterns', ()))
+            literals.update(patterns.get('decorators', ()))
+            for literal in patterns.get('imports', ()):
+                self._import_literal_frameworks.setdefault(literal, []).append(framework)
+        
+        self._literal_regex, self._contained_literals = _compile_literals(literals)
+        self._import_regex, self._contained_imports = _compile_literals(self._import_literal_frameworks)
+        
+        # Imported module name -> frameworks it indicates; the same imports recur in every file
+        self._import_frameworks: Dict[str, Set[str]] = {}
+    
+    def _frameworks_for_import(self, imp_str: str) -> Set[str]:
+        """Get the frameworks whose import literals occur in an imported name."""
+        frameworks = self._import_frameworks.get(imp_str)
+        if frameworks is None:
+            frameworks = set()
+            for match in self._import_regex.finditer(imp_str):
+                for literal in self._contained_imports[match.group()]:
+                    frameworks.update(self._import_literal_frameworks[literal])
+            self._import_frameworks[imp_str] = frameworks
+        return frameworks
+    
     def _scan_project(self):
         """Scan the project to detect frameworks."""
-        py_files = list(self.project_root.rglob("*.py"))
+        cached_files = self._load_scan_cache()
+        scanned_files = {}
         
-        for py_file in py_files[:50]:  # Sample first 50 files for performance
+        for py_file in self._sample_files():
+            # Detection only ever adds frameworks, so stop once nothing is left to find
+            if len(self.detected_frameworks) == len(self.FRAMEWORK_PATTERNS):
+                break
+            
             try:
-                content = py_file.read_text(encoding='utf-8')
-                self._analyze_file(content, py_file)
+                st = py_file.stat()
+                cached = cached_files.get(str(py_file))
+                if cached and cached[:2] == [st.st_mtime_ns, st.st_size]:
+                    evidence = cached[2]
+                else:
+                    with open(py_file, 'rb') as f:
+                        content = f.read().decode('utf-8')
+                    evidence = self._find_evidence(content, py_file)
             except Exception:
                 continue
+            
+            scanned_files[str(py_file)] = [st.st_mtime_ns, st.st_size, evidence]
+            self._record_evidence(evidence)
+        
+        self._save_scan_cache(scanned_files)
+    
+    def _sample_files(self) -> List[Path]:
+        """Pick SAMPLE_SIZE files spread evenly over the whole project.
+        
+        Reservoir sampling (Algorithm R) over the lazy walk, so the sample is
+        not just the first directories visited. The generator is seeded so a
+        project always gets the same sample, and the sample is returned in
+        walk order so evidence is reported in a stable order.
+        """
+        rng = random.Random(0)
+        sample = []
+        for index, py_file in enumerate(iter_py_files(self.project_root)):
+            if index < self.SAMPLE_SIZE:
+                sample.append((index, py_file))
+            else:
+                slot = rng.randint(0, index)
+                if slot < self.SAMPLE_SIZE:
+                    sample[slot] = (index, py_file)
+        return [py_file for _, py_file in sorted(sample)]
+    
+    @staticmethod
+    def default_cache_dir() -> Path:
+        """Get the per-user directory for framework scan results."""
+        return user_cache_dir() / 'frameworks'
+    
+    def _scan_cache_path(self) -> Path:
+        """Get the scan cache file for this project."""
+        digest = hashlib.sha1(str(self.project_root.resolve()).encode('utf-8')).hexdigest()
+        return self.cache_dir / f'{digest}.json'
+    
+    def _patterns_digest(self) -> str:
+        """Fingerprint FRAMEWORK_PATTERNS so cached results die with pattern changes."""
+        return hashlib.sha1(repr(self.FRAMEWORK_PATTERNS).encode('utf-8')).hexdigest()
+    
+    def _load_scan_cache(self) -> Dict[str, list]:
+        """Load cached per-file results as path -> [mtime_ns, size, evidence]."""
+        cache_path = self._scan_cache_path()
+        try:
+            with open(cache_path, encoding='utf-8') as f:
+                cache = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        if cache.get('patterns') != self._patterns_digest():
+            return {}
+        return cache.get('files', {})
+    
+    def _save_scan_cache(self, scanned_files: Dict[str, list]):
+        """Write the scan cache atomically; failures only cost a future re-scan."""
+        cache_path = self._scan_cache_path()
+        try:
+            self.cache_dir.mkdir(mode=0o700, parents=True, exist_ok=True)
+            tmp_path = cache_path.with_suffix(f'.{os.getpid()}.tmp')
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump({'patterns': self._patterns_digest(), 'files': scanned_files}, f)
+            os.replace(tmp_path, cache_path)
+        except OSError:
+            pass
     
     def _analyze_file(self, content: str, filepath: Path):
         """Analyze a single file for framework indicators."""
+        self._record_evidence(self._find_evidence(content, filepath))
+    
+    def _find_evidence(self, content: str, filepath: Path) -> List[Tuple[str, str]]:
+        """Collect (framework, evidence) pairs for a single file."""
+        evidence = []
+        
         # Check imports
-        import_pattern = re.compile(r'^(?:from\s+(\S+)|import\s+(\S+))', re.MULTILINE)
-        imports = import_pattern.findall(content)
+        imports = [(imp[0] or imp[1]) for imp in _IMPORT_RE.findall(content)]
+        import_frameworks = [self._frameworks_for_import(imp_str) for imp_str in imports]
+        
+        # Every code pattern and decorator literal in the file, in one scan
+        found = set()
+        for match in self._literal_regex.finditer(content):
+            found.update(self._contained_literals[match.group()])
         
         for framework, patterns in self.FRAMEWORK_PATTERNS.items():
             # Check import patterns
             if 'imports' in patterns:
-                for imp in imports:
-                    imp_str = imp[0] or imp[1]
-                    if any(pattern in imp_str for pattern in patterns['imports']):
-                        self.detected_frameworks.add(framework)
-                        self._add_evidence(framework, f"Import found: {imp_str} in {filepath.name}")
+                for imp_str, frameworks in zip(imports, import_frameworks):
+                    if framework in frameworks:
+                        evidence.append((framework, f"Import found: {imp_str} in {filepath.name}"))
             
             # Check code patterns
             if 'patterns' in patterns:
                 for pattern in patterns['patterns']:
-                    if pattern in content:
-                        self.detected_frameworks.add(framework)
-                        self._add_evidence(framework, f"Pattern found: {pattern} in {filepath.name}")
+                    if pattern in found:
+                        evidence.append((framework, f"Pattern found: {pattern} in {filepath.name}"))
             
             # Check decorators
             if 'decorators' in patterns:
                 for decorator in patterns['decorators']:
-                    if decorator in content:
-                        self.detected_frameworks.add(framework)
-                        self._add_evidence(framework, f"Decorator found: {decorator} in {filepath.name}")
+                    if decorator in found:
+                        evidence.append((framework, f"Decorator found: {decorator} in {filepath.name}"))
+        
+        return evidence
+    
+    def _record_evidence(self, evidence: List[Tuple[str, str]]):
+        """Mark frameworks as detected from a file's evidence."""
+        for framework, description in evidence:
+            self.detected_frameworks.add(framework)
+            self._add_evidence(framework, description)
     
     def _add_evidence(self, framework: str, evidence: str):
         """Add evidence for framework detection."""
         if framework not in self.framework_evidence:
             self.framework_evidence[framework] = []
-        self.framework_evidence[framework].append(evidence)
+            self.evidence_counts[framework] = 0
+        self.evidence_counts[framework] += 1
+        if len(self.framework_evidence[framework]) < self.MAX_EVIDENCE:
+            self.framework_evidence[framework].append(evidence)
     
     def get_frameworks(self) -> Set[str]:
         """Get detected frameworks."""
@@ -179,10 +324,7 @@ class FrameworkDetector:
     
     def is_typing_pattern(self, line: str) -> bool:
         """Check if a line matches a typing pattern."""
-        for pattern_type, regex in self.TYPING_PATTERNS.items():
-            if re.match(regex, line.strip()):
-                return True
-        return False
+        return self._TYPING_RE.match(line.strip()) is not None
     
     def get_report(self) -> str:
         """Generate a detection report."""
@@ -194,10 +336,11 @@ class FrameworkDetector:
             for framework in sorted(self.detected_frameworks):
                 if framework in self.framework_evidence:
                     report.append(f"\n{framework}:")
-                    for evidence in self.framework_evidence[framework][:3]:  # Show first 3
+                    for evidence in self.framework_evidence[framework]:
                         report.append(f"  - {evidence}")
-                    if len(self.framework_evidence[framework]) > 3:
-                        report.append(f"  ... and {len(self.framework_evidence[framework]) - 3} more")
+                    remaining = self.evidence_counts[framework] - len(self.framework_evidence[framework])
+                    if remaining > 0:
+                        report.append(f"  ... and {remaining} more")
         else:
             report.append("\nNo frameworks detected")
         
@@ -210,9 +353,22 @@ class FrameworkDetector:
         return "\n".join(report)
 
 
-def detect_frameworks(project_root: str) -> FrameworkDetector:
+def _compile_literals(literals) -> Tuple[re.Pattern, Dict[str, List[str]]]:
+    """Compile literals into one alternation, plus each literal's contained literals.
+    
+    Longest literals are tried first so '@app.route' wins over '@app.'; a match
+    then also counts for every literal it contains, so nested literals are found
+    without an overlapping (lookahead) scan.
+    """
+    ordered = sorted(literals, key=len, reverse=True)
+    regex = re.compile('|'.join(re.escape(lit) for lit in ordered))
+    contained = {lit: [other for other in ordered if other in lit] for lit in ordered}
+    return regex, contained
+
+
+def detect_frameworks(project_root: str, cache_dir: Optional[Path] = None) -> FrameworkDetector:
     """Main entry point for framework detection."""
-    return FrameworkDetector(Path(project_root))
+    return FrameworkDetector(Path(project_root), cache_dir)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+Parse Cache for Grammar-Ops
+
+Persists parsed ASTs between runs so unchanged files skip the tokenizer and
+parser. Entries are keyed on the file's mtime and size, so any edit to a file
+invalidates its entry.
+
+Entries are pickles, and unpickling runs code, so the cache lives in a
+per-user directory (see ``ParseCache.default_dir``) that only this user's
+own runs write to. It must never be pointed inside an analyzed project,
+where a checkout could ship crafted entries.
+
+Sources are kept as raw bytes: ast.parse decodes them itself (honouring any
+PEP 263 coding declaration), so callers only decode when they need text.
+"""
+
+import ast
+import hashlib
+import os
+import pickle
+import sys
+from pathlib import Path
+from typing import Optional, Tuple
+
+
+def user_cache_dir() -> Path:
+    """Get the per-user grammar-ops cache directory, outside any analyzed tree."""
+    base = os.environ.get('XDG_CACHE_HOME') or os.path.join(os.path.expanduser('~'), '.cache')
+    return Path(base) / 'grammar-ops'
+
+
+def parse_file(file_path: Path) -> Tuple[bytes, ast.Module]:
+    """Read a file as bytes and parse it, without a separate text decoding pass."""
+    # A plain read is deliberate: compile() copies any buffer it is given into
+    # a bytes object, so parsing from an mmap would add a copy, not remove one
+    with open(file_path, 'rb') as f:
+        source = f.read()
+    return source, ast.parse(source, filename=str(file_path), type_comments=False)
+
+
+class ParseCache:
+    """On-disk cache of ``(source bytes, ast.Module)`` pairs keyed by file stat."""
+    
+    def __init__(self, cache_dir: Optional[Path] = None):
+        self.cache_dir = Path(cache_dir) if cache_dir else self.default_dir()
+        self.hits = 0
+        self.misses = 0
+    
+    @staticmethod
+    def default_dir() -> Path:
+        """Get the per-user directory for parsed trees."""
+        return user_cache_dir() / 'ast'
+    
+    def load(self, file_path: Path) -> Tuple[bytes, ast.Module]:
+        """Return the source and parsed tree for a file, parsing only on a cache miss."""
+        file_path = Path(file_path)
+        st = file_path.stat()
+        # Pickled ASTs are only valid for the Python version that produced them
+        key = (st.st_mtime_ns, st.st_size, sys.version_info[:2])
+        entry_path = self._entry_path(file_path)
+        
+        cached = self._read_entry(entry_path)
+        if cached is not None and cached[0] == key:
+            self.hits += 1
+            return cached[1], cached[2]
+        
+        self.misses += 1
+        source, tree = parse_file(file_path)
+        self._write_entry(entry_path, (key, source, tree))
+        return source, tree
+    
+    def _entry_path(self, file_path: Path) -> Path:
+        """Get the cache file for a source file."""
+        digest = hashlib.sha1(str(file_path.resolve()).encode('utf-8')).hexdigest()
+        return self.cache_dir / f'{digest}.pkl'
+    
+    def _read_entry(self, entry_path: Path) -> Optional[tuple]:
+        """Read a cache entry, treating unreadable entries as misses."""
+        try:
+            with open(entry_path, 'rb') as f:
+                return pickle.load(f)
+        except Exception:
+            return None
+    
+    def _write_entry(self, entry_path: Path, entry: tuple):
+        """Write a cache entry atomically; failures only cost a future re-parse."""
+        try:
+            # Private to this user: anyone able to write here could run code
+            self.cache_dir.mkdir(mode=0o700, parents=True, exist_ok=True)
+            tmp_path = entry_path.with_suffix(f'.{os.getpid()}.tmp')
+            with open(tmp_path, 'wb') as f:
+                pickle.dump(entry, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, entry_path)
+        except (OSError, pickle.PicklingError, RecursionError):
+            pass
@@ -5,16 +5,71 @@ Enhanced Error Reporter for Grammar-Ops
 Provides context-aware, helpful error messages with actionable suggestions.
 """
 
+import io
 import json
-from pathlib import Path
-from typing import Dict, List, Optional, Tuple
-from datetime import datetime
+import os
+import sys
+import time
+from collections import ChainMap, Counter
+from typing import Dict, Iterator, Optional, TextIO, Tuple
+from functools import lru_cache
 import textwrap
 
 
+# Explanation templates, dedented once at import. {gray_open}/{gray_close} and
+# {code_open}/{code_close} are filled in from EnhancedReporter._style_fields.
+_CLI_COMMAND_EXPLANATION = textwrap.dedent("""
+    {gray_open}CLI commands traditionally use one of two styles:{gray_close}
+    {gray_open}  1. Rails-style:{gray_close} {code_open}start{code_close}, {code_open}stop{code_close}, {code_open}build{code_close}
+    {gray_open}  2. Verb-noun style:{gray_close} {code_open}start_server{code_close}, {code_open}stop_server{code_close}
+    
+    {gray_open}Your project appears to use Rails-style based on detected patterns.{gray_close}
+    """).strip()
+
+_TEST_FUNCTION_EXPLANATION = textwrap.dedent("""
+    {gray_open}Test functions already have{gray_close} {code_open}test_{code_close} {gray_open}as their verb prefix.{gray_close}
+    {gray_open}The current name{gray_close} {code_open}{function}{code_close} {gray_open}follows testing conventions.{gray_close}
+    """).strip()
+
+_FACTORY_EXPLANATION = textwrap.dedent("""
+    {gray_open}Response factory functions follow constructor naming patterns:{gray_close}
+    {gray_open}  • Pattern:{gray_close} {code_open}noun_response(){code_close} {gray_open}returns a Response object{gray_close}
+    {gray_open}  • Reads naturally:{gray_close} {code_open}return success_response(data){code_close}
+    """).strip()
+
+_REGULAR_FUNCTION_EXPLANATION = textwrap.dedent("""
+    {gray_open}Function{gray_close} {code_open}{function}{code_close} {gray_open}should start with a verb to indicate its action.{gray_close}
+    {gray_open}This makes code more readable and self-documenting.{gray_close}
+    """).strip()
+
+_SINGLETON_EXPLANATION = textwrap.dedent("""
+    {gray_open}This is a singleton instance, not a constant.{gray_close}
+    {gray_open}Framework objects like{gray_close} {code_open}app = FastAPI(){code_close} {gray_open}use lowercase by convention.{gray_close}
+    """).strip()
+
+_TYPEVAR_EXPLANATION = textwrap.dedent("""
+    {gray_open}TypeVar follows Python typing conventions:{gray_close}
+    {gray_open}  • Single letter:{gray_close} {code_open}T = TypeVar("T"){code_close}
+    {gray_open}  • Descriptive:{gray_close} {code_open}TUser = TypeVar("TUser"){code_close}
+    """).strip()
+
+_LOGGER_EXPLANATION = textwrap.dedent("""
+    {gray_open}Logger instances are variables, not constants.{gray_close}
+    {gray_open}Standard pattern:{gray_close} {code_open}logger = logging.getLogger(__name__){code_close}
+    """).strip()
+
+_CONSTANT_EXPLANATION = textwrap.dedent("""
+    {gray_open}Constants should use UPPER_CASE naming convention.{gray_close}
+    {gray_open}This clearly distinguishes them from variables.{gray_close}
+    """).strip()
+
+
 class EnhancedReporter:
     """Generate enhanced error reports with context and suggestions."""
     
+    # Rule under the summary title
+    SEPARATOR = '=' * 50
+    
     # ANSI color codes for terminal output
     COLORS = {
         'reset': '\033[0m',
@@ -42,221 +97,272 @@ class EnhancedReporter:
         'question': '❓'
     }
     
+    # Human-friendly descriptions of function contexts
+    CONTEXT_INFO = {
+        'cli_command': {
+            'description': 'CLI Command',
+            'explanation': 'Command-line interface commands often use Rails-style naming'
+        },
+        'test_function': {
+            'description': 'Test Function',
+            'explanation': 'Test functions already have test_ prefix'
+        },
+        'response_factory': {
+            'description': 'Response Factory',
+            'explanation': 'Factory functions that create response objects'
+        },
+        'api_endpoint': {
+            'description': 'API Endpoint Handler',
+            'explanation': 'HTTP endpoint handlers should indicate the action'
+        },
+        'pytest_fixture': {
+            'description': 'Pytest Fixture',
+            'explanation': 'Fixtures represent resources, not actions'
+        },
+        'event_handler': {
+            'description': 'Event Handler',
+            'explanation': 'Event handlers already have action prefixes'
+        },
+        'property': {
+            'description': 'Property',
+            'explanation': 'Properties are attributes, not actions'
+        },
+        'regular_function': {
+            'description': 'Regular Function',
+            'explanation': 'Standard functions should indicate what action they perform'
+        }
+    }
+    
     def __init__(self, config: Optional[Dict] = None, use_color: bool = True):
         self.config = config or {}
         self.use_color = use_color
+        self._bind_style_helpers()
+        
+        # Explanation formatters by function context and by constant type;
+        # anything else gets the generic explanation
+        self._function_explanations = {
+            'cli_command': self._format_cli_command_explanation,
+            'test_function': self._format_test_function_explanation,
+            'response_factory': self._format_factory_explanation,
+        }
+        self._constant_explanations = {
+            'singleton': self._format_singleton_explanation,
+            'typevar': self._format_typevar_explanation,
+            'logger': self._format_logger_explanation,
+        }
+        
+        # The static parts of the fix options repeat on every issue, so render
+        # them once; whole lines for fixed options, prefixes for the rest
+        self._option_lines = {
+            'accept': f"    1. {self._success('Accept suggestion')}: Rename to ",
+            'exception': f"    2. {self._info('Add exception')}: Add ",
+            'cli_style': f"    3. {self._info('Change style')}: Configure CLI style in .grammarops.config.json",
+            'skip': f"    4. {self._gray('Skip')}: Leave as-is for now",
+            'valid': f"    1. {self._info('Add exception')}: This is a valid ",
+            'rename': f"    1. {self._success('Rename')}: Change to ",
+            'constant_skip': f"    2. {self._gray('Skip')}: Leave as-is",
+        }
+        
+        # Fixed headings, each written with a single call
+        emoji = self._emojis
+        self._headings = {
+            'suggestion': f"\n\n{emoji['suggestion']} Suggestion:",
+            'options': f"\n\n  {emoji['question']} Options:",
+            'summary': f"\n{self._bold('Grammar-Ops Analysis Summary')}\n{self.SEPARATOR}",
+            'no_issues': (
+                f"\n\n{emoji['success']} {self._success('No issues found!')}"
+                f"\n{self._gray('Your code follows all configured naming conventions.')}"
+            ),
+            'contexts': f"\n\n{self._bold('Function contexts:')}",
+            'recommendations': f"\n\n{emoji['suggestion']} {self._bold('Recommendations:')}",
+        }
     
-    def format_function_issue(self, issue: Dict) -> str:
-        """Format a function naming issue with context."""
-        lines = []
+    def _bind_style_helpers(self):
+        """Bind the color/style helpers once for the chosen output mode."""
+        if not self.use_color:
+            self._bold = self._error = self._success = _plain
+            self._warning = self._info = self._gray = _plain
+            self._code = _backticked
+            self._emojis = dict.fromkeys(self.EMOJI, '')
+            self._style_fields = {
+                'gray_open': '', 'gray_close': '', 'code_open': '`', 'code_close': '`',
+            }
+            return
         
+        reset = self.COLORS['reset']
+        self._style_fields = {
+            'gray_open': self.COLORS['gray'], 'gray_close': reset,
+            'code_open': self.COLORS['cyan'], 'code_close': reset,
+        }
+        self._bold = _styler(self.COLORS['bold'], reset)
+        self._error = _styler(self.COLORS['red'], reset)
+        self._success = _styler(self.COLORS['green'], reset)
+        self._warning = _styler(self.COLORS['yellow'], reset)
+        self._info = _styler(self.COLORS['blue'], reset)
+        self._code = _styler(self.COLORS['cyan'], reset)
+        self._gray = _styler(self.COLORS['gray'], reset)
+        self._emojis = self.EMOJI
+    
+    def format_function_issue(self, issue: Dict, out: Optional[TextIO] = None) -> Optional[str]:
+        """Format a function naming issue with context.
+        
+        With out, the issue is written there followed by a newline, as print
+        would; otherwise the formatted text is returned.
+        """
+        if out is None:
+            buf = io.StringIO()
+            self._write_function_issue(issue, buf.write)
+            return buf.getvalue()
+        
+        self._write_function_issue(issue, out.write)
+        out.write('\n')
+        return None
+    
+    def _write_function_issue(self, issue: Dict, write):
+        """Write a function naming issue's lines."""
+        emoji = self._emojis
         # Header with file location
-        file_path = Path(issue['file'])
-        relative_path = file_path.name  # Could make relative to project root
+        relative_path = os.path.basename(issue['file'])  # Could make relative to project root
         
-        lines.append(f"\n{self._emoji('file')} {self._bold(relative_path)}:{issue['line']}")
-        lines.append(f"{self._emoji('function')} Function: {self._code(issue['function'])}")
+        write(f"\n{emoji['file']} {self._bold(relative_path)}:{issue['line']}")
+        write(f"\n{emoji['function']} Function: {self._code(issue['function'])}")
         
         # Context information
         context_info = self._get_context_info(issue['context'])
-        lines.append(f"{self._emoji('context')} Context: {self._info(context_info['description'])}")
+        write(f"\n{emoji['context']} Context: {self._info(context_info['description'])}")
         
         # Issue description
-        lines.append(f"{self._emoji('error')} Issue: {self._error(issue['issue'])}")
+        write(f"\n{emoji['error']} Issue: {self._error(issue['issue'])}\n")
         
         # Detailed explanation based on context
-        if issue['context'] == 'cli_command':
-            lines.append(self._format_cli_command_explanation(issue))
-        elif issue['context'] == 'test_function':
-            lines.append(self._format_test_function_explanation(issue))
-        elif issue['context'] == 'response_factory':
-            lines.append(self._format_factory_explanation(issue))
-        else:
-            lines.append(self._format_regular_function_explanation(issue))
+        explain = self._function_explanations.get(issue['context'], self._format_regular_function_explanation)
+        write(explain(issue))
         
         # Suggestion if available
         if issue.get('suggestion'):
-            lines.append(f"\n{self._emoji('suggestion')} Suggestion:")
-            lines.append(f"  Rename to: {self._success(issue['suggestion'])}")
+            write(self._headings['suggestion'])
+            write(f"\n  Rename to: {self._success(issue['suggestion'])}")
         
         # Show decorators if relevant
         if issue.get('decorators'):
-            lines.append(f"\n  Decorators: {', '.join(self._code(d) for d in issue['decorators'])}")
+            write(f"\n\n  Decorators: {', '.join(self._code(d) for d in issue['decorators'])}")
         
         # Quick fix options
-        lines.append(f"\n  {self._emoji('question')} Options:")
-        lines.extend(self._format_fix_options(issue))
-        
-        return '\n'.join(lines)
+        write(self._headings['options'])
+        for option in self._format_fix_options(issue):
+            write('\n')
+            write(option)
+    
+    def format_constant_issue(self, issue: Dict, out: Optional[TextIO] = None) -> Optional[str]:
+        """Format a constant naming issue with context.
+        
+        With out, the issue is written there followed by a newline, as print
+        would; otherwise the formatted text is returned.
+        """
+        if out is None:
+            buf = io.StringIO()
+            self._write_constant_issue(issue, buf.write)
+            return buf.getvalue()
+        
+        self._write_constant_issue(issue, out.write)
+        out.write('\n')
+        return None
     
-    def format_constant_issue(self, issue: Dict) -> str:
-        """Format a constant naming issue with context."""
-        lines = []
-        
+    def _write_constant_issue(self, issue: Dict, write):
+        """Write a constant naming issue's lines."""
+        emoji = self._emojis
         # Header
-        file_path = Path(issue['file'])
-        lines.append(f"\n{self._emoji('file')} {self._bold(file_path.name)}:{issue['line']}")
-        lines.append(f"{self._emoji('constant')} Constant: {self._code(issue['name'])}")
+        write(f"\n{emoji['file']} {self._bold(os.path.basename(issue['file']))}:{issue['line']}")
+        write(f"\n{emoji['constant']} Constant: {self._code(issue['name'])}")
         
         # Type and value preview
-        lines.append(f"{self._emoji('context')} Type: {self._info(issue['type'])}")
-        lines.append(f"  Value: {self._gray(issue['current_value'])}")
+        write(f"\n{emoji['context']} Type: {self._info(issue['type'])}")
+        write(f"\n  Value: {self._gray(issue['current_value'])}")
         
         # Issue
-        lines.append(f"{self._emoji('error')} Issue: {self._error(issue['issue'])}")
+        write(f"\n{emoji['error']} Issue: {self._error(issue['issue'])}\n")
         
         # Context-specific explanation
-        if issue['type'] == 'singleton':
-            lines.append(self._format_singleton_explanation(issue))
-        elif issue['type'] == 'typevar':
-            lines.append(self._format_typevar_explanation(issue))
-        elif issue['type'] == 'logger':
-            lines.append(self._format_logger_explanation(issue))
-        else:
-            lines.append(self._format_constant_explanation(issue))
+        explain = self._constant_explanations.get(issue['type'], self._format_constant_explanation)
+        write(explain(issue))
         
         # Options
-        lines.append(f"\n  {self._emoji('question')} Options:")
-        lines.extend(self._format_constant_fix_options(issue))
-        
-        return '\n'.join(lines)
+        write(self._headings['options'])
+        for option in self._format_constant_fix_options(issue):
+            write('\n')
+            write(option)
     
     def _get_context_info(self, context: str) -> Dict:
         """Get human-friendly context information."""
-        contexts = {
-            'cli_command': {
-                'description': 'CLI Command',
-                'explanation': 'Command-line interface commands often use Rails-style naming'
-            },
-            'test_function': {
-                'description': 'Test Function',
-                'explanation': 'Test functions already have test_ prefix'
-            },
-            'response_factory': {
-                'description': 'Response Factory',
-                'explanation': 'Factory functions that create response objects'
-            },
-            'api_endpoint': {
-                'description': 'API Endpoint Handler',
-                'explanation': 'HTTP endpoint handlers should indicate the action'
-            },
-            'pytest_fixture': {
-                'description': 'Pytest Fixture',
-                'explanation': 'Fixtures represent resources, not actions'
-            },
-            'event_handler': {
-                'description': 'Event Handler',
-                'explanation': 'Event handlers already have action prefixes'
-            },
-            'property': {
-                'description': 'Property',
-                'explanation': 'Properties are attributes, not actions'
-            },
-            'regular_function': {
-                'description': 'Regular Function',
-                'explanation': 'Standard functions should indicate what action they perform'
-            }
-        }
-        
-        return contexts.get(context, {
-            'description': context,
-            'explanation': 'Function context not recognized'
-        })
+        info = self.CONTEXT_INFO.get(context)
+        if info is None:
+            info = _unknown_context_info(context)
+        return info
     
     def _format_cli_command_explanation(self, issue: Dict) -> str:
         """Format explanation for CLI command issues."""
-        return textwrap.dedent(f"""
-        {self._gray('CLI commands traditionally use one of two styles:')}
-        {self._gray('  1. Rails-style:')} {self._code('start')}, {self._code('stop')}, {self._code('build')}
-        {self._gray('  2. Verb-noun style:')} {self._code('start_server')}, {self._code('stop_server')}
-        
-        {self._gray('Your project appears to use Rails-style based on detected patterns.')}
-        """).strip()
+        return _CLI_COMMAND_EXPLANATION.format_map(self._style_fields)
     
     def _format_test_function_explanation(self, issue: Dict) -> str:
         """Format explanation for test function issues."""
-        return textwrap.dedent(f"""
-        {self._gray('Test functions already have')} {self._code('test_')} {self._gray('as their verb prefix.')}
-        {self._gray('The current name')} {self._code(issue['function'])} {self._gray('follows testing conventions.')}
-        """).strip()
+        return _TEST_FUNCTION_EXPLANATION.format_map(
+            ChainMap({'function': issue['function']}, self._style_fields)
+        )
     
     def _format_factory_explanation(self, issue: Dict) -> str:
         """Format explanation for factory function issues."""
-        return textwrap.dedent(f"""
-        {self._gray('Response factory functions follow constructor naming patterns:')}
-        {self._gray('  • Pattern:')} {self._code('noun_response()')} {self._gray('returns a Response object')}
-        {self._gray('  • Reads naturally:')} {self._code('return success_response(data)')}
-        """).strip()
+        return _FACTORY_EXPLANATION.format_map(self._style_fields)
     
     def _format_regular_function_explanation(self, issue: Dict) -> str:
         """Format explanation for regular function issues."""
-        name = issue['function']
-        return textwrap.dedent(f"""
-        {self._gray('Function')} {self._code(name)} {self._gray('should start with a verb to indicate its action.')}
-        {self._gray('This makes code more readable and self-documenting.')}
-        """).strip()
+        return _REGULAR_FUNCTION_EXPLANATION.format_map(
+            ChainMap({'function': issue['function']}, self._style_fields)
+        )
     
     def _format_singleton_explanation(self, issue: Dict) -> str:
         """Format explanation for singleton issues."""
-        return textwrap.dedent(f"""
-        {self._gray('This is a singleton instance, not a constant.')}
-        {self._gray('Framework objects like')} {self._code('app = FastAPI()')} {self._gray('use lowercase by convention.')}
-        """).strip()
+        return _SINGLETON_EXPLANATION.format_map(self._style_fields)
     
     def _format_typevar_explanation(self, issue: Dict) -> str:
         """Format explanation for TypeVar issues."""
-        return textwrap.dedent(f"""
-        {self._gray('TypeVar follows Python typing conventions:')}
-        {self._gray('  • Single letter:')} {self._code('T = TypeVar("T")')}
-        {self._gray('  • Descriptive:')} {self._code('TUser = TypeVar("TUser")')}
-        """).strip()
+        return _TYPEVAR_EXPLANATION.format_map(self._style_fields)
     
     def _format_logger_explanation(self, issue: Dict) -> str:
         """Format explanation for logger issues."""
-        return textwrap.dedent(f"""
-        {self._gray('Logger instances are variables, not constants.')}
-        {self._gray('Standard pattern:')} {self._code('logger = logging.getLogger(__name__)')}
-        """).strip()
+        return _LOGGER_EXPLANATION.format_map(self._style_fields)
     
     def _format_constant_explanation(self, issue: Dict) -> str:
         """Format explanation for regular constant issues."""
-        return textwrap.dedent(f"""
-        {self._gray('Constants should use UPPER_CASE naming convention.')}
-        {self._gray('This clearly distinguishes them from variables.')}
-        """).strip()
+        return _CONSTANT_EXPLANATION.format_map(self._style_fields)
     
-    def _format_fix_options(self, issue: Dict) -> List[str]:
+    def _format_fix_options(self, issue: Dict) -> Iterator[str]:
         """Format fix options for function issues."""
-        options = []
+        lines = self._option_lines
         
         if issue.get('suggestion'):
-            options.append(f"    1. {self._success('Accept suggestion')}: Rename to {self._code(issue['suggestion'])}")
+            yield lines['accept'] + self._code(issue['suggestion'])
         
-        options.append(f"    2. {self._info('Add exception')}: Add {self._code(issue['function'])} to .grammarops.exceptions.json")
+        yield f"{lines['exception']}{self._code(issue['function'])} to .grammarops.exceptions.json"
         
         if issue['context'] == 'cli_command':
-            options.append(f"    3. {self._info('Change style')}: Configure CLI style in .grammarops.config.json")
-        
-        options.append(f"    4. {self._gray('Skip')}: Leave as-is for now")
+            yield lines['cli_style']
         
-        return options
+        yield lines['skip']
     
-    def _format_constant_fix_options(self, issue: Dict) -> List[str]:
+    def _format_constant_fix_options(self, issue: Dict) -> Iterator[str]:
         """Format fix options for constant issues."""
-        options = []
+        lines = self._option_lines
         
         if issue['type'] in ['singleton', 'logger', 'typevar']:
-            options.append(f"    1. {self._info('Add exception')}: This is a valid {issue['type']}")
+            yield lines['valid'] + issue['type']
             exception_pattern = self._get_exception_pattern(issue)
             if exception_pattern:
-                options.append(f"       Add pattern: {self._code(exception_pattern)}")
+                yield f"       Add pattern: {self._code(exception_pattern)}"
         else:
             suggested_name = issue['name'].upper().replace('-', '_')
-            options.append(f"    1. {self._success('Rename')}: Change to {self._code(suggested_name)}")
+            yield lines['rename'] + self._code(suggested_name)
         
-        options.append(f"    2. {self._gray('Skip')}: Leave as-is")
-        
-        return options
+        yield lines['constant_skip']
     
     def _get_exception_pattern(self, issue: Dict) -> Optional[str]:
         """Get exception pattern for the issue."""
@@ -268,112 +374,115 @@ class EnhancedReporter:
             return f"^{issue['name']} = logging\\\\.getLogger"
         return None
     
-    def generate_summary(self, all_issues: Dict) -> str:
-        """Generate a summary report."""
-        lines = []
+    def generate_summary(self, all_issues: Dict, out: Optional[TextIO] = None) -> Optional[str]:
+        """Generate a summary report.
         
-        lines.append(f"\n{self._bold('Grammar-Ops Analysis Summary')}")
-        lines.append("=" * 50)
+        With out, the summary is written there followed by a newline, as print
+        would; otherwise the report text is returned.
+        """
+        if out is None:
+            buf = io.StringIO()
+            self._write_summary(all_issues, buf.write)
+            return buf.getvalue()
+        
+        self._write_summary(all_issues, out.write)
+        out.write('\n')
+        return None
+    
+    def _write_summary(self, all_issues: Dict, write):
+        """Write the summary report's lines."""
+        emoji = self._emojis
+        write(self._headings['summary'])
         
         total = sum(len(issues) for issues in all_issues.values())
         
         if total == 0:
-            lines.append(f"\n{self._emoji('success')} {self._success('No issues found!')}")
-            lines.append(self._gray("Your code follows all configured naming conventions."))
+            write(self._headings['no_issues'])
         else:
-            lines.append(f"\n{self._emoji('info')} Total issues: {self._bold(str(total))}")
+            write(f"\n\n{emoji['info']} Total issues: {self._bold(str(total))}")
             
             # Breakdown by type
             for issue_type, issues in all_issues.items():
                 if issues:
-                    lines.append(f"  • {issue_type.title()}: {len(issues)}")
+                    write(f"\n  • {issue_type.title()}: {len(issues)}")
+            
+            # One pass over each list feeds both the breakdown and the recommendations
+            context_counts = Counter(issue.get('context', 'unknown') for issue in all_issues.get('functions', ()))
+            type_counts = Counter(issue.get('type', 'unknown') for issue in all_issues.get('constants', ()))
             
             # Context breakdown for functions
-            if 'functions' in all_issues and all_issues['functions']:
-                context_counts = {}
-                for issue in all_issues['functions']:
-                    ctx = issue.get('context', 'unknown')
-                    context_counts[ctx] = context_counts.get(ctx, 0) + 1
-                
-                lines.append(f"\n{self._bold('Function contexts:')}")
+            if context_counts:
+                write(self._headings['contexts'])
                 for ctx, count in sorted(context_counts.items()):
                     ctx_info = self._get_context_info(ctx)
-                    lines.append(f"  • {ctx_info['description']}: {count}")
+                    write(f"\n  • {ctx_info['description']}: {count}")
             
             # Recommendations
-            lines.append(f"\n{self._emoji('suggestion')} {self._bold('Recommendations:')}")
-            lines.extend(self._generate_recommendations(all_issues))
+            write(self._headings['recommendations'])
+            for recommendation in self._generate_recommendations(context_counts, type_counts):
+                write('\n')
+                write(recommendation)
         
         # Timestamp
-        lines.append(f"\n{self._gray(f'Report generated: {datetime.now().strftime("%Y-%m-%d %H:%M:%S")}')}")
-        
-        return '\n'.join(lines)
+        write(f"\n\n{self._gray(f'Report generated: {time.strftime("%Y-%m-%d %H:%M:%S")}')}")
     
-    def _generate_recommendations(self, all_issues: Dict) -> List[str]:
-        """Generate smart recommendations based on issues."""
-        recommendations = []
-        
-        # Check for patterns
-        func_issues = all_issues.get('functions', [])
-        const_issues = all_issues.get('constants', [])
-        
+    def _generate_recommendations(self, context_counts: Counter, type_counts: Counter) -> Iterator[str]:
+        """Generate smart recommendations from function context and constant type counts."""
         # CLI command pattern
-        cli_commands = [i for i in func_issues if i.get('context') == 'cli_command']
-        if len(cli_commands) > 3:
-            recommendations.append(
-                f"  • {self._info('CLI Style')}: Found {len(cli_commands)} CLI commands. "
+        cli_commands = context_counts['cli_command']
+        if cli_commands > 3:
+            yield (
+                f"  • {self._info('CLI Style')}: Found {cli_commands} CLI commands. "
                 f"Consider setting {self._code('\"cli_commands\": \"rails_style\"')} in config."
             )
         
         # Singleton pattern
-        singletons = [i for i in const_issues if i.get('type') == 'singleton']
+        singletons = type_counts['singleton']
         if singletons:
-            recommendations.append(
-                f"  • {self._info('Singletons')}: Found {len(singletons)} singleton instances. "
+            yield (
+                f"  • {self._info('Singletons')}: Found {singletons} singleton instances. "
                 f"These are valid lowercase names."
             )
         
         # TypeVar pattern
-        typevars = [i for i in const_issues if i.get('type') == 'typevar']
+        typevars = type_counts['typevar']
         if typevars:
-            recommendations.append(
-                f"  • {self._info('TypeVars')}: Found {len(typevars)} TypeVar declarations. "
+            yield (
+                f"  • {self._info('TypeVars')}: Found {typevars} TypeVar declarations. "
                 f"Add {self._code('\"allow_typevar\": true')} to config."
             )
         
         # Gradual adoption
-        if len(func_issues) + len(const_issues) > 50:
-            recommendations.append(
-                f"  • {self._warning('Gradual Adoption')}: With {len(func_issues) + len(const_issues)} issues, "
+        total = sum(context_counts.values()) + sum(type_counts.values())
+        if total > 50:
+            yield (
+                f"  • {self._warning('Gradual Adoption')}: With {total} issues, "
                 f"consider gradual adoption. Use {self._code('grammar-ops-migrate.py')} for assistance."
             )
-        
-        return recommendations
-    
-    # Color/style helpers
-    def _bold(self, text: str) -> str:
-        return f"{self.COLORS['bold']}{text}{self.COLORS['reset']}" if self.use_color else text
-    
-    def _error(self, text: str) -> str:
-        return f"{self.COLORS['red']}{text}{self.COLORS['reset']}" if self.use_color else text
-    
-    def _success(self, text: str) -> str:
-        return f"{self.COLORS['green']}{text}{self.COLORS['reset']}" if self.use_color else text
-    
-    def _warning(self, text: str) -> str:
-        return f"{self.COLORS['yellow']}{text}{self.COLORS['reset']}" if self.use_color else text
-    
-    def _info(self, text: str) -> str:
-        return f"{self.COLORS['blue']}{text}{self.COLORS['reset']}" if self.use_color else text
-    
-    def _code(self, text: str) -> str:
-        return f"{self.COLORS['cyan']}{text}{self.COLORS['reset']}" if self.use_color else f"`{text}`"
-    
-    def _gray(self, text: str) -> str:
-        return f"{self.COLORS['gray']}{text}{self.COLORS['reset']}" if self.use_color else text
-    
-    def _emoji(self, name: str) -> str:
-        return self.EMOJI.get(name, '') if self.use_color else ''
+
+
+@lru_cache(maxsize=64)
+def _unknown_context_info(context: str) -> Dict:
+    """Describe a context EnhancedReporter.CONTEXT_INFO doesn't know."""
+    return {
+        'description': context,
+        'explanation': 'Function context not recognized'
+    }
+
+
+def _styler(start: str, reset: str):
+    """Make a helper that wraps text in a precomputed escape sequence."""
+    def style(text: str) -> str:
+        return f"{start}{text}{reset}"
+    return style
+
+
+def _plain(text: str) -> str:
+    return text
+
+
+def _backticked(text: str) -> str:
+    return f"`{text}`"
 
 
 # Example usage in other scripts
@@ -381,18 +490,23 @@ def enhance_error_reporting(issues: Dict, config: Optional[Dict] = None) -> None
     """Enhanced error reporting for grammar-ops tools."""
     reporter = EnhancedReporter(config)
     
+    # Format everything into one buffer and write it in one go
+    out = io.StringIO()
+    
     # Show individual issues
     if 'functions' in issues:
         for issue in issues['functions'][:10]:  # Limit to first 10
-            print(reporter.format_function_issue(issue))
+            reporter.format_function_issue(issue, out)
     
     if 'constants' in issues:
         for issue in issues['constants'][:10]:  # Limit to first 10
-            print(reporter.format_constant_issue(issue))
+            reporter.format_constant_issue(issue, out)
     
     # Show summary
-    print(reporter.generate_summary(issues))
-
+    reporter.generate_summary(issues, out)
+    
+    sys.stdout.write(out.getvalue())
+    sys.stdout.flush()
 
 if __name__ == "__main__":
     # Demo the enhanced reporter
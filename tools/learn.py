@@ -7,31 +7,44 @@ and exception rules. This helps adopt grammar-ops without massive refactoring.
 """
 
 import ast
+import heapq
 import json
+import os
 import re
 import sys
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 from typing import Dict, List, Set, Tuple, Optional
-from collections import defaultdict, Counter
+from collections import defaultdict, deque, Counter
 import argparse
 
 # Add parent directory to path for imports
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
-from lib.core import FrameworkDetector
+from lib.core import FrameworkDetector, iter_py_files, parse_file
 from lib.analyzers import FunctionContext, AssignmentContext
 
+# A leading verb, ending at an underscore, a capital or the end of the name
+# so that e.g. 'getter' and 'settings' don't count
+_VERB_PREFIX_RE = re.compile(
+    r'(?:get|set|create|update|delete|process|validate|check|handle|parse|build|load|save)'
+    r'(?:_|[A-Z]|$)'
+)
+
 
 class PatternLearner:
     """Learns naming patterns from existing code."""
     
-    def __init__(self, project_root: Path):
+    # Directories whose files never inform the learned conventions
+    SKIP_DIRS = frozenset({'.git', '__pycache__', 'node_modules', 'venv', '.env', 'migrations'})
+    
+    def __init__(self, project_root: Path, framework_detector: Optional[FrameworkDetector] = None):
         self.project_root = Path(project_root)
-        self.framework_detector = FrameworkDetector(project_root)
+        self.framework_detector = framework_detector or FrameworkDetector(project_root)
         
-        # Pattern collections
-        self.function_patterns = defaultdict(list)
-        self.constant_patterns = defaultdict(list)
+        # Pattern collections, one list per field rather than a dict per item
+        self.function_patterns = defaultdict(_function_columns)
+        self.constant_patterns = defaultdict(_constant_columns)
         self.class_patterns = []
         self.module_patterns = []
         
@@ -55,50 +68,85 @@ class PatternLearner:
                 'typevars': set()
             }
         }
+        
+        # Statement type -> (learning method, stats counter, parent types it
+        # counts under or None for anywhere). Constants are only module and
+        # class attributes, never a function's local variables
+        self._node_handlers = {
+            ast.FunctionDef: (self._learn_function_pattern, 'functions', None),
+            ast.AsyncFunctionDef: (self._learn_function_pattern, 'functions', None),
+            ast.ClassDef: (self._learn_class_pattern, 'classes', None),
+            ast.Assign: (self._learn_constant_pattern, 'constants', (ast.Module, ast.ClassDef)),
+        }
     
-    def learn_from_project(self):
+    def learn_from_project(self, max_workers: Optional[int] = None):
         """Learn patterns from the entire project."""
         print(f"Learning patterns from {self.project_root}...")
         
-        # Analyze Python files
-        py_files = list(self.project_root.rglob("*.py"))
+        py_files = list(iter_py_files(self.project_root, self.SKIP_DIRS))
+        if max_workers is None:
+            max_workers = min(os.cpu_count() or 1, len(py_files))
+        
+        if max_workers > 1:
+            # Files are learned from independently, so parse them across a pool;
+            # map keeps file order, so merged patterns match a serial run
+            with ProcessPoolExecutor(max_workers=max_workers,
+                                     initializer=_init_worker,
+                                     initargs=(self.project_root, self.framework_detector)) as pool:
+                for learned in pool.map(_learn_file_in_worker, py_files, chunksize=16):
+                    self._merge_learned(learned)
+        else:
+            for py_file in py_files:
+                self._analyze_file(py_file)
+        
+        # Module names come from the paths alone
         for py_file in py_files:
-            if self._should_skip_file(py_file):
-                continue
-            
-            self._analyze_file(py_file)
             self.stats['files_analyzed'] += 1
-        
-        # Analyze module structure
-        self._learn_module_patterns()
+            self._learn_module_pattern(py_file)
         
         # Process learned patterns
         self._process_patterns()
     
-    def _should_skip_file(self, file_path: Path) -> bool:
-        """Check if file should be skipped."""
-        skip_dirs = {'.git', '__pycache__', 'node_modules', 'venv', '.env', 'migrations'}
-        return any(skip_dir in file_path.parts for skip_dir in skip_dirs)
+    def _learned(self) -> Tuple:
+        """Get everything learned from files, in the form _merge_learned takes."""
+        return (
+            dict(self.function_patterns), dict(self.constant_patterns),
+            self.class_patterns, self.learned_exceptions, self.stats,
+        )
+    
+    def _merge_learned(self, learned: Tuple):
+        """Fold patterns learned by another learner into this one."""
+        function_patterns, constant_patterns, class_patterns, exceptions, stats = learned
+        for context_type, columns in function_patterns.items():
+            for field, values in columns.items():
+                self.function_patterns[context_type][field] += values
+        for assign_type, columns in constant_patterns.items():
+            for field, values in columns.items():
+                self.constant_patterns[assign_type][field] += values
+        self.class_patterns += class_patterns
+        
+        self.learned_exceptions['functions'] |= exceptions['functions']
+        self.learned_exceptions['constants'] |= exceptions['constants']
+        for kind, names in exceptions['patterns'].items():
+            self.learned_exceptions['patterns'][kind] |= names
+        
+        for key in ('functions', 'constants', 'classes'):
+            self.stats[key] += stats[key]
     
     def _analyze_file(self, file_path: Path):
         """Analyze a single file for patterns."""
         try:
-            content = file_path.read_text(encoding='utf-8')
-            tree = ast.parse(content)
+            _, tree = parse_file(file_path)
             
             # Learn from different node types
-            for node in ast.walk(tree):
-                if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
-                    self._learn_function_pattern(node, file_path)
-                    self.stats['functions'] += 1
-                
-                elif isinstance(node, ast.ClassDef):
-                    self._learn_class_pattern(node)
-                    self.stats['classes'] += 1
-                
-                elif isinstance(node, ast.Assign):
-                    self._learn_constant_pattern(node, file_path)
-                    self.stats['constants'] += 1
+            handlers = self._node_handlers
+            for node, parent in _iter_statements(tree):
+                handler = handlers.get(type(node))
+                if handler is not None:
+                    learn, stat, parent_types = handler
+                    if parent_types is None or isinstance(parent, parent_types):
+                        learn(node, file_path)
+                        self.stats[stat] += 1
         
         except Exception as e:
             print(f"Error analyzing {file_path}: {e}")
@@ -120,11 +168,10 @@ class PatternLearner:
                 self.learned_exceptions['functions'].add(node.name)
         
         # Store pattern
-        self.function_patterns[context.context_type].append({
-            'name': node.name,
-            'decorators': context.decorators,
-            'file': str(file_path.relative_to(self.project_root))
-        })
+        columns = self.function_patterns[context.context_type]
+        columns['names'].append(node.name)
+        columns['decorators'].append(context.decorators)
+        columns['files'].append(str(file_path.relative_to(self.project_root)))
     
     def _learn_constant_pattern(self, node: ast.Assign, file_path: Path):
         """Learn from constant naming patterns."""
@@ -146,39 +193,29 @@ class PatternLearner:
                     if not target.id.isupper():
                         self.learned_exceptions['constants'].add(target.id)
                 
-                # Store pattern
-                self.constant_patterns[context.assignment_type].append({
-                    'name': target.id,
-                    'type': context.assignment_type,
-                    'value_preview': context.value_str[:50]
-                })
+                # Store pattern; the type is the key it is stored under
+                columns = self.constant_patterns[context.assignment_type]
+                columns['names'].append(target.id)
+                columns['value_previews'].append(context.value_str[:50])
     
-    def _learn_class_pattern(self, node: ast.ClassDef):
+    def _learn_class_pattern(self, node: ast.ClassDef, file_path: Path):
         """Learn from class naming patterns."""
         self.class_patterns.append({
             'name': node.name,
-            'bases': [ast.unparse(base) for base in node.bases],
+            'bases': [_base_name(base) for base in node.bases],
             'is_exception': node.name.endswith('Exception') or node.name.endswith('Error')
         })
     
-    def _learn_module_patterns(self):
-        """Learn from module/package naming patterns."""
-        py_files = list(self.project_root.rglob("*.py"))
-        
-        for py_file in py_files:
-            if self._should_skip_file(py_file):
-                continue
-            
-            module_name = py_file.stem
-            if module_name != '__init__':
-                self.module_patterns.append(module_name)
-                self.stats['modules'] += 1
+    def _learn_module_pattern(self, file_path: Path):
+        """Learn from a module's naming pattern."""
+        module_name = file_path.stem
+        if module_name != '__init__':
+            self.module_patterns.append(module_name)
+            self.stats['modules'] += 1
     
     def _has_verb_prefix(self, name: str) -> bool:
         """Check if name has a verb prefix."""
-        verbs = ['get', 'set', 'create', 'update', 'delete', 'process', 
-                'validate', 'check', 'handle', 'parse', 'build', 'load', 'save']
-        return any(name.startswith(verb) for verb in verbs)
+        return _VERB_PREFIX_RE.match(name) is not None
     
     def _process_patterns(self):
         """Process learned patterns to identify conventions."""
@@ -229,8 +266,9 @@ class PatternLearner:
                 }
             },
             "exceptions": {
-                "functions": sorted(list(self.learned_exceptions['functions']))[:20],
-                "constants": sorted(list(self.learned_exceptions['constants']))[:20],
+                # Only the first 20 are kept, so don't sort the rest
+                "functions": heapq.nsmallest(20, self.learned_exceptions['functions']),
+                "constants": heapq.nsmallest(20, self.learned_exceptions['constants']),
                 "patterns": {
                     "allow": self._generate_allow_patterns()
                 }
@@ -285,18 +323,18 @@ class PatternLearner:
         
         # Function patterns
         report.append("\nFunction Patterns:")
-        for context_type, patterns in self.function_patterns.items():
-            if patterns:
-                report.append(f"  {context_type}: {len(patterns)} functions")
+        for context_type, columns in self.function_patterns.items():
+            if columns['names']:
+                report.append(f"  {context_type}: {len(columns['names'])} functions")
                 # Show examples
-                for pattern in patterns[:3]:
-                    report.append(f"    - {pattern['name']} ({pattern['file']})")
+                for name, file in zip(columns['names'][:3], columns['files'][:3]):
+                    report.append(f"    - {name} ({file})")
         
         # Constant patterns
         report.append("\nConstant Patterns:")
-        for assign_type, patterns in self.constant_patterns.items():
-            if patterns:
-                report.append(f"  {assign_type}: {len(patterns)} assignments")
+        for assign_type, columns in self.constant_patterns.items():
+            if columns['names']:
+                report.append(f"  {assign_type}: {len(columns['names'])} assignments")
         
         # Learned exceptions
         report.append("\nLearned Exceptions:")
@@ -319,6 +357,66 @@ class PatternLearner:
         return "\n".join(report)
 
 
+def _base_name(node: ast.expr) -> str:
+    """Get a class base's source text, reading plain dotted names directly."""
+    parts = []
+    expr = node
+    while isinstance(expr, ast.Attribute):
+        parts.append(expr.attr)
+        expr = expr.value
+    if not isinstance(expr, ast.Name):
+        return ast.unparse(node)  # Generic[T], calls and the like
+    parts.append(expr.id)
+    return '.'.join(reversed(parts))
+
+
+def _function_columns() -> Dict[str, List]:
+    """Empty per-field lists for one context type's functions."""
+    return {'names': [], 'decorators': [], 'files': []}
+
+
+def _constant_columns() -> Dict[str, List]:
+    """Empty per-field lists for one assignment type's constants."""
+    return {'names': [], 'value_previews': []}
+
+
+# Per-process arguments set by _init_worker
+_worker_args: Tuple = ()
+
+
+def _init_worker(project_root: Path, framework_detector: FrameworkDetector):
+    """Process pool initializer for PatternLearner.learn_from_project."""
+    global _worker_args
+    _worker_args = (project_root, framework_detector)
+
+
+def _learn_file_in_worker(file_path: Path) -> Tuple:
+    """Learn from one file with a fresh learner, returning what it learned."""
+    learner = PatternLearner(*_worker_args)
+    learner._analyze_file(file_path)
+    return learner._learned()
+
+
+# Nodes that can hold statements; expressions never do
+_STATEMENT_NODES = (ast.stmt, ast.excepthandler, ast.match_case)
+
+
+def _iter_statements(tree: ast.Module):
+    """Yield ``(statement, parent)`` for every statement in a tree, breadth-first like ast.walk.
+    
+    Expressions, arguments and other non-statement nodes are never entered,
+    which skips most of the tree; the statements come out in the same order
+    ast.walk would produce them.
+    """
+    todo = deque([tree])
+    while todo:
+        node = todo.popleft()
+        for child in ast.iter_child_nodes(node):
+            if isinstance(child, _STATEMENT_NODES):
+                todo.append(child)
+                yield child, node
+
+
 def main():
     parser = argparse.ArgumentParser(
         description="Learn naming patterns from existing code"
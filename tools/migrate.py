@@ -8,18 +8,21 @@ Supports interactive fixing, safe transformations, and rollback.
 
 import ast
 import json
+import re
 import shutil
 import argparse
 import sys
+from collections import defaultdict
 from pathlib import Path
 from datetime import datetime
+from functools import lru_cache
 from typing import Dict, List, Tuple, Optional, Set
 import difflib
 
 # Add parent directory to path for imports
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
-from lib.core import FrameworkDetector
+from lib.core import FrameworkDetector, ParseCache
 from lib.analyzers import ContextAwareFunctionAnalyzer, SmartConstantAnalyzer
 
 
@@ -33,13 +36,24 @@ class CodeMigrator:
         
         # Migration state
         self.backup_dir = self.project_root / '.grammar-ops-backup'
-        self.migration_log = []
+        self.log_path = self.project_root / '.grammar-ops-migration.log'
+        self._log_file = None  # Opened for appending when the first file is fixed
         self.fixed_files = set()
         self.skipped_files = set()
         
+        # Source bytes of files with issues, read once by analyze()
+        self._sources: Dict[str, bytes] = {}
+        
+        # Paths containing any of these are skipped; one alternation checks them all
+        skip_patterns = self.config.get('paths', {}).get('exclude', []) + [
+            '.git', '__pycache__', 'migrations', '.grammar-ops-backup',
+        ]
+        self._skip_regex = re.compile('|'.join(re.escape(pattern) for pattern in skip_patterns))
+        
         # Analyzers
         self.function_analyzer = ContextAwareFunctionAnalyzer(self.framework_detector)
         self.constant_analyzer = SmartConstantAnalyzer(self.framework_detector)
+        self.parse_cache = ParseCache()
     
     def _load_config(self, config_path: Optional[Path]) -> Dict:
         """Load grammar-ops configuration."""
@@ -86,23 +100,31 @@ class CodeMigrator:
             if self._should_skip_file(py_file):
                 continue
             
+            # Read and parse once for both analyzers, reusing trees from earlier
+            # runs; on failure they read the file themselves and report the error
+            try:
+                source, tree = self.parse_cache.load(py_file)
+            except Exception:
+                source = tree = None
+            
             # Analyze functions
-            func_issues = self.function_analyzer.analyze_file(py_file)
+            func_issues = self.function_analyzer.analyze_file(py_file, source, tree)
             issues['functions'].extend(func_issues)
             
             # Analyze constants
-            const_issues = self.constant_analyzer.analyze_file(py_file)
+            const_issues = self.constant_analyzer.analyze_file(py_file, source, tree)
             issues['constants'].extend(const_issues)
+            
+            # Keep the source for migration only where there is something to fix
+            if source is not None and (func_issues or const_issues):
+                self._sources[str(py_file)] = source
         
         issues['total'] = len(issues['functions']) + len(issues['constants'])
         return issues
     
     def _should_skip_file(self, file_path: Path) -> bool:
         """Check if file should be skipped."""
-        skip_patterns = self.config.get('paths', {}).get('exclude', [])
-        skip_patterns.extend(['.git', '__pycache__', 'migrations', '.grammar-ops-backup'])
-        
-        return any(pattern in str(file_path) for pattern in skip_patterns)
+        return self._skip_regex.search(str(file_path)) is not None
     
     def migrate_interactive(self, issues: Dict, dry_run: bool = False):
         """Interactively migrate code with user confirmation."""
@@ -125,19 +147,12 @@ class CodeMigrator:
     
     def _group_issues_by_file(self, issues: Dict) -> Dict[str, List]:
         """Group all issues by file."""
-        files_to_fix = {}
-        
-        for func_issue in issues['functions']:
-            file_path = func_issue['file']
-            if file_path not in files_to_fix:
-                files_to_fix[file_path] = []
-            files_to_fix[file_path].append(('function', func_issue))
+        files_to_fix = defaultdict(list)
         
-        for const_issue in issues['constants']:
-            file_path = const_issue['file']
-            if file_path not in files_to_fix:
-                files_to_fix[file_path] = []
-            files_to_fix[file_path].append(('constant', const_issue))
+        for issue_type, file_issues in (('function', issues['functions']),
+                                        ('constant', issues['constants'])):
+            for issue in file_issues:
+                files_to_fix[issue['file']].append((issue_type, issue))
         
         return files_to_fix
     
@@ -146,14 +161,23 @@ class CodeMigrator:
         print(f"\n{file_path.relative_to(self.project_root)}")
         print("-" * len(str(file_path.relative_to(self.project_root))))
         
-        # Read file content
-        original_content = file_path.read_text()
-        modified_content = original_content
+        # Read file content, reusing the bytes analyze() already read
+        source = self._sources.pop(str(file_path), None)
+        if source is None:
+            original_content = file_path.read_text(encoding='utf-8')
+        else:
+            original_content = source.decode('utf-8')
+        
+        # Previews are all taken from the file as read, so split it only once
+        original_lines = original_content.splitlines()
         
         # Sort issues by line number (reverse order to avoid offset issues)
         issues.sort(key=lambda x: x[1].get('line', 0), reverse=True)
         
         changes_made = []
+        # Accepted renames, applied together once every issue has been seen
+        function_renames = {}
+        constant_renames = {}
         
         for issue_type, issue in issues:
             if issue_type == 'function' and issue.get('can_auto_fix'):
@@ -167,7 +191,7 @@ class CodeMigrator:
                     
                     # Show diff preview
                     self._show_diff_preview(
-                        modified_content,
+                        original_lines,
                         issue['function'],
                         issue['suggestion'],
                         issue['line']
@@ -177,11 +201,7 @@ class CodeMigrator:
                     response = self._ask_user("Apply this fix?", ['y', 'n', 's', 'q'])
                     
                     if response == 'y':
-                        modified_content = self._apply_function_fix(
-                            modified_content,
-                            issue['function'],
-                            issue['suggestion']
-                        )
+                        function_renames[issue['function']] = issue['suggestion']
                         changes_made.append(f"Renamed {issue['function']} to {issue['suggestion']}")
                     elif response == 's':
                         print("Skipped")
@@ -199,7 +219,7 @@ class CodeMigrator:
                 
                 # Show diff preview
                 self._show_diff_preview(
-                    modified_content,
+                    original_lines,
                     issue['name'],
                     suggestion,
                     issue['line']
@@ -209,11 +229,7 @@ class CodeMigrator:
                 response = self._ask_user("Apply this fix?", ['y', 'n', 's', 'q'])
                 
                 if response == 'y':
-                    modified_content = self._apply_constant_fix(
-                        modified_content,
-                        issue['name'],
-                        suggestion
-                    )
+                    constant_renames[issue['name']] = suggestion
                     changes_made.append(f"Renamed {issue['name']} to {suggestion}")
                 elif response == 's':
                     print("Skipped")
@@ -221,6 +237,9 @@ class CodeMigrator:
                     print("Quitting migration")
                     return
         
+        modified_content = self._apply_function_fixes(original_content, function_renames)
+        modified_content = self._apply_constant_fixes(modified_content, constant_renames)
+        
         # Save changes if any were made
         if changes_made and not dry_run:
             # Backup original
@@ -229,10 +248,10 @@ class CodeMigrator:
             shutil.copy2(file_path, backup_path)
             
             # Write modified content
-            file_path.write_text(modified_content)
+            file_path.write_text(modified_content, encoding='utf-8')
             
             self.fixed_files.add(str(file_path))
-            self.migration_log.append({
+            self._log_change({
                 'file': str(file_path.relative_to(self.project_root)),
                 'changes': changes_made,
                 'timestamp': datetime.now().isoformat()
@@ -242,10 +261,8 @@ class CodeMigrator:
         else:
             self.skipped_files.add(str(file_path))
     
-    def _show_diff_preview(self, content: str, old_name: str, new_name: str, line_num: int):
-        """Show a diff preview of the change."""
-        lines = content.splitlines()
-        
+    def _show_diff_preview(self, lines: List[str], old_name: str, new_name: str, line_num: int):
+        """Show a diff preview of the change against the file's lines."""
         # Find the actual line (line numbers are 1-indexed)
         if 0 <= line_num - 1 < len(lines):
             old_line = lines[line_num - 1]
@@ -265,42 +282,34 @@ class CodeMigrator:
                 return response
             print(f"  Please enter one of: {options_str}")
     
-    def _apply_function_fix(self, content: str, old_name: str, new_name: str) -> str:
-        """Apply function renaming fix."""
-        # Use regex for more precise replacement
-        import re
+    def _apply_function_fixes(self, content: str, renames: Dict[str, str]) -> str:
+        """Apply function renaming fixes, all in one pass over the content."""
+        if not renames:
+            return content
         
-        # Replace function definition
-        pattern = rf'\bdef\s+{re.escape(old_name)}\s*\('
-        content = re.sub(pattern, f'def {new_name}(', content)
+        # Definitions and calls (basic - could be improved); longest names first
+        # so no name is cut short by another it starts with
+        names = '|'.join(re.escape(name) for name in sorted(renames, key=len, reverse=True))
+        pattern = re.compile(rf'(\bdef\s+)?\b({names})\s*\(')
         
-        # Replace function calls (basic - could be improved)
-        pattern = rf'\b{re.escape(old_name)}\s*\('
-        content = re.sub(pattern, f'{new_name}(', content)
+        def replace(match):
+            prefix = 'def ' if match.group(1) else ''
+            return f'{prefix}{renames[match.group(2)]}('
         
-        return content
+        return pattern.sub(replace, content)
     
-    def _apply_constant_fix(self, content: str, old_name: str, new_name: str) -> str:
-        """Apply constant renaming fix."""
-        import re
-        
-        # Replace constant definition and usage
-        pattern = rf'\b{re.escape(old_name)}\b'
-        content = re.sub(pattern, new_name, content)
-        
-        return content
+    def _apply_constant_fixes(self, content: str, renames: Dict[str, str]) -> str:
+        """Apply constant renaming fixes to definitions and usages in one pass."""
+        if not renames:
+            return content
+        
+        names = '|'.join(re.escape(name) for name in sorted(renames, key=len, reverse=True))
+        pattern = re.compile(rf'\b({names})\b')
+        return pattern.sub(lambda match: renames[match.group(1)], content)
     
     def _suggest_constant_name(self, name: str) -> str:
         """Suggest UPPER_CASE version of constant name."""
-        # Convert camelCase or lowercase to UPPER_CASE
-        import re
-        
-        # Insert underscores before capitals
-        s1 = re.sub('(.)([A-Z][a-z]+)', r'\1_\2', name)
-        # Insert underscores before number sequences
-        s2 = re.sub('([a-z0-9])([A-Z])', r'\1_\2', s1)
-        # Convert to uppercase
-        return s2.upper()
+        return _upper_case_name(name)
     
     def rollback(self):
         """Rollback all changes made during migration."""
@@ -322,19 +331,45 @@ class CodeMigrator:
         shutil.rmtree(self.backup_dir)
         print("\n✓ Rollback complete!")
     
+    def _log_change(self, entry: Dict):
+        """Append one fixed file's changes to the migration log as a JSON line."""
+        if self._log_file is None:
+            self._log_file = open(self.log_path, 'a', encoding='utf-8')
+        self._log_file.write(json.dumps(entry) + '\n')
+        # Flushed per file so the log survives an interrupted migration
+        self._log_file.flush()
+    
     def save_migration_log(self):
-        """Save migration log for reference."""
-        log_path = self.project_root / '.grammar-ops-migration.log'
+        """Finish the migration log with a summary line."""
+        if self._log_file is None:
+            self._log_file = open(self.log_path, 'a', encoding='utf-8')
         
-        with open(log_path, 'w') as f:
-            json.dump({
+        with self._log_file as f:
+            f.write(json.dumps({
                 'migration_date': datetime.now().isoformat(),
                 'files_fixed': len(self.fixed_files),
                 'files_skipped': len(self.skipped_files),
-                'changes': self.migration_log
-            }, f, indent=2)
+            }) + '\n')
+        self._log_file = None
         
-        print(f"\nMigration log saved to: {log_path}")
+        print(f"\nMigration log saved to: {self.log_path}")
+
+
+# Word boundaries inside camelCase names: before a capitalized word, and
+# between a lowercase letter or digit and a capital
+_CAPITALIZED_WORD_RE = re.compile(r'(.)([A-Z][a-z]+)')
+_LOWER_UPPER_RE = re.compile(r'([a-z0-9])([A-Z])')
+
+
+@lru_cache(maxsize=4096)
+def _upper_case_name(name: str) -> str:
+    """Convert a camelCase or lowercase name to UPPER_CASE; names recur across files."""
+    # Insert underscores before capitals
+    s1 = _CAPITALIZED_WORD_RE.sub(r'\1_\2', name)
+    # Insert underscores before number sequences
+    s2 = _LOWER_UPPER_RE.sub(r'\1_\2', s1)
+    # Convert to uppercase
+    return s2.upper()
 
 
 def main():